@@ -0,0 +1,100 @@
+import threading
+
+CONTEXT_TOKEN_BUDGET = 1500  # history tokens sent with every turn
+KEEP_RECENT_TURNS = 6        # newest exchanges always kept verbatim
+
+def estimate_text_tokens(text):
+    # Tamil/Hindi text tokenizes denser than English, so count ~3 characters per token
+    return len(text) // 3 + 1
+
+class ChatContext:
+    """Running summary plus recent exchanges for one conversation session"""
+
+    def __init__(self, session_id, summarizer, token_budget=CONTEXT_TOKEN_BUDGET):
+        self.session_id = session_id
+        # summarizer(summary, turns) -> new summary text, or None if it could not be made
+        self.summarizer = summarizer
+        self.token_budget = token_budget
+        self.summary = ""
+        self.turns = []  # [(user_text, model_text)]
+        self.lock = threading.Lock()
+        self.compacting = False
+
+    def is_empty(self):
+        with self.lock:
+            return not self.summary and not self.turns
+
+    def history(self):
+        """Chat history in the format expected by GenerativeModel.start_chat"""
+        with self.lock:
+            history = []
+            if self.summary:
+                history.append({"role": "user", "parts": [f"Summary of our conversation so far: {self.summary}"]})
+                history.append({"role": "model", "parts": ["சரி, நினைவில் வைத்துக்கொள்கிறேன்."]})
+            for user_text, model_text in self.turns:
+                history.append({"role": "user", "parts": [user_text]})
+                history.append({"role": "model", "parts": [model_text]})
+            return history
+
+    def token_count(self):
+        with self.lock:
+            return self._token_count()
+
+    def _token_count(self):
+        return estimate_text_tokens(self.summary) + sum(
+            estimate_text_tokens(user_text) + estimate_text_tokens(model_text)
+            for user_text, model_text in self.turns
+        )
+
+    def add_turn(self, user_text, model_text):
+        with self.lock:
+            self.turns.append((user_text, model_text))
+            over_budget = self._token_count() > self.token_budget
+            start = over_budget and not self.compacting and len(self.turns) > KEEP_RECENT_TURNS
+            if start:
+                self.compacting = True
+        if start:
+            # Summarize off the request path so the next turn is not delayed
+            threading.Thread(target=self._compact, daemon=True).start()
+
+    def _compact(self):
+        with self.lock:
+            old_turns = self.turns[:-KEEP_RECENT_TURNS]
+            summary = self.summary
+
+        new_summary = None
+        try:
+            new_summary = self.summarizer(summary, old_turns)
+        except Exception as e:
+            print(f"⚠️ Context summarization failed: {e}")
+
+        with self.lock:
+            # Turns added while summarizing stay; only the summarized prefix is replaced
+            self.turns = self.turns[len(old_turns):]
+            if new_summary:
+                self.summary = new_summary.strip()
+            # Without a summary just keep dropping the oldest turns until we fit
+            while self._token_count() > self.token_budget and len(self.turns) > 1:
+                self.turns.pop(0)
+            self.compacting = False
+        print(f"🗜️ Compacted context for {self.session_id}: {self.token_count()} tokens")
+
+class ContextRegistry:
+    """Chat contexts by session id"""
+
+    def __init__(self, summarizer):
+        self.summarizer = summarizer
+        self.contexts = {}
+        self.lock = threading.Lock()
+
+    def get(self, session_id):
+        with self.lock:
+            context = self.contexts.get(session_id)
+            if context is None:
+                context = ChatContext(session_id, self.summarizer)
+                self.contexts[session_id] = context
+            return context
+
+    def drop(self, session_id):
+        with self.lock:
+            self.contexts.pop(session_id, None)
@@ -1,12 +1,23 @@
-from config import get_model
+from config import get_model, GEMINI_RPM, GEMINI_TPM
+from ai.response_cache import ResponseCache
+from ai.request_scheduler import RequestScheduler, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from ai.chat_context import ContextRegistry
+from intents import router, TIME_KEYWORDS, DATE_KEYWORDS
+import atexit
+import datetime
 import re
+import threading
 import time
-from threading import Lock
 
-# Rate limiting
-last_request_time = 0
-rate_limit_lock = Lock()
-MIN_REQUEST_INTERVAL = 2  # seconds between requests
+# Rate limiting: queue requests against the real quota instead of dropping them
+scheduler = RequestScheduler(GEMINI_RPM, GEMINI_TPM)
+INTERACTIVE_MAX_WAIT = 8  # seconds a voice turn may wait before we answer with a fallback
+SUMMARY_MAX_WAIT = 30     # background summaries can wait much longer
+EXPECTED_OUTPUT_TOKENS = 400  # budgeted per request until the real usage is known
+
+# Cache of real Gemini answers (fallback responses are never stored)
+response_cache = ResponseCache(skip_keywords=TIME_KEYWORDS + DATE_KEYWORDS)
+atexit.register(response_cache.save)
 
 def clean_response(text):
     # Remove leading bullet characters like "*", "-", etc.
@@ -16,21 +27,129 @@ def clean_response(text):
         cleaned_lines.append(cleaned_line)
     return "\n".join(cleaned_lines)
 
-def get_response(prompt):
-    global last_request_time
+# Sentence boundaries for streaming: English/Tamil punctuation, Hindi danda, newlines
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।])\s+|\n+")
+MIN_CHUNK_CHARS = 20  # avoid emitting tiny fragments like list numbers
+
+def split_sentences(buffer):
+    """Split buffered text into complete sentences and the unfinished remainder"""
+    sentences = []
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(buffer):
+        sentence = buffer[start:match.start()]
+        if sentence.strip():
+            sentences.append(sentence.strip())
+        start = match.end()
+    return sentences, buffer[start:]
+
+def group_sentences(sentences, pending=""):
+    """Clean sentences and merge them into chunks of at least MIN_CHUNK_CHARS; returns (chunks, pending)"""
+    chunks = []
+    for sentence in sentences:
+        pending = f"{pending} {clean_response(sentence)}".strip()
+        if len(pending) >= MIN_CHUNK_CHARS:
+            chunks.append(pending)
+            pending = ""
+    return chunks, pending
+
+def chunk_answer(text):
+    """A complete answer as the same chunks stream_response yields while it is generated"""
+    sentences, rest = split_sentences(text)
+    chunks, pending = group_sentences(sentences)
+    tail = f"{pending} {clean_response(rest.strip())}".strip()
+    if tail:
+        chunks.append(tail)
+    return chunks
+
+def estimate_tokens(prompt):
+    """Rough token estimate for scheduling (about 4 characters per token plus the answer)"""
+    return len(prompt) // 4 + EXPECTED_OUTPUT_TOKENS
+
+def record_usage(estimated, response):
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", 0) if usage else 0
+    if total:
+        scheduler.record_usage(estimated, total)
+
+def summarize_conversation(summary, turns):
+    """Fold older exchanges into the running summary (background priority, None on failure)"""
+    transcript = "\n".join(f"User: {user_text}\nZara: {model_text}" for user_text, model_text in turns)
+    prompt = (
+        "Update this running summary of a conversation between a user and Zara, the voice assistant. "
+        "Use at most 5 short sentences in the conversation's language and keep names, facts and open questions.\n"
+        f"Current summary: {summary or '(none)'}\n"
+        f"New exchanges:\n{transcript}"
+    )
+    estimated = estimate_tokens(prompt)
+    if not scheduler.acquire(estimated, priority=PRIORITY_BACKGROUND, max_wait=SUMMARY_MAX_WAIT):
+        return None
+    response = get_model().generate_content(prompt)
+    record_usage(estimated, response)
+    return response.text
+
+# Per-session multi-turn context
+chat_contexts = ContextRegistry(summarize_conversation)
+
+def _use_cache(context):
+    """Answers built on a session's history don't belong in the shared prompt-keyed cache"""
+    return context is None or context.is_empty()
+
+CONNECTION_IDLE_SECONDS = 60  # after this long without a call the client connection may have gone cold
+last_request_at = 0.0
+
+def _send(prompt, context, stream=False):
+    """Send prompt either standalone or as the next turn of the session's chat"""
+    global last_request_at
+    last_request_at = time.monotonic()
+    if context is None:
+        return get_model().generate_content(prompt, stream=stream)
+    chat = get_model().start_chat(history=context.history())
+    return chat.send_message(prompt, stream=stream)
+
+def prewarm(session_id=None):
+    """Get ready for a prompt the user is still speaking: session context and a live connection"""
+    global last_request_at
+    if session_id:
+        chat_contexts.get(session_id)
+    if time.monotonic() - last_request_at < CONNECTION_IDLE_SECONDS:
+        return False
+    last_request_at = time.monotonic()
+
+    def warm():
+        # count_tokens is a cheap round trip that does not use the generate quota
+        try:
+            get_model().count_tokens("வணக்கம்")
+        except Exception as e:
+            print(f"⚠️ Gemini pre-warm failed: {e}")
+    threading.Thread(target=warm, daemon=True).start()
+    return True
+
+def get_response(prompt, priority=PRIORITY_INTERACTIVE, max_wait=INTERACTIVE_MAX_WAIT, session_id=None):
+    context = chat_contexts.get(session_id) if session_id else None
+    use_cache = _use_cache(context)
+
+    cached = response_cache.get(prompt) if use_cache else None
+    if cached is not None:
+        print("⚡ Cache hit - skipping Gemini request")
+        if context is not None:
+            context.add_turn(prompt, cached)
+        return cached
 
     # Rate limiting
-    with rate_limit_lock:
-        current_time = time.time()
-        if current_time - last_request_time < MIN_REQUEST_INTERVAL:
-            print("⏳ Rate limiting - using fallback response")
-            return get_fallback_response(prompt)
-        last_request_time = current_time
+    estimated = estimate_tokens(prompt) + (context.token_count() if context else 0)
+    if not scheduler.acquire(estimated, priority=priority, max_wait=max_wait):
+        print("⏳ Rate limiting - using fallback response")
+        return get_fallback_response(prompt)
 
     try:
-        model = get_model()
-        response = model.generate_content(prompt)
-        return clean_response(response.text)
+        response = _send(prompt, context)
+        record_usage(estimated, response)
+        answer = clean_response(response.text)
+        if use_cache:
+            response_cache.put(prompt, answer)
+        if context is not None:
+            context.add_turn(prompt, answer)
+        return answer
     except Exception as e:
         error_msg = str(e).lower()
 
@@ -43,65 +162,92 @@ def get_response(prompt):
         print(f"❌ Gemini API error: {e}")
         return get_fallback_response(prompt)
 
+def stream_response(prompt, priority=PRIORITY_INTERACTIVE, max_wait=INTERACTIVE_MAX_WAIT, session_id=None):
+    """Yield the Gemini answer as cleaned, sentence-sized chunks while it is generated"""
+    context = chat_contexts.get(session_id) if session_id else None
+    use_cache = _use_cache(context)
+
+    cached = response_cache.get(prompt) if use_cache else None
+    if cached is not None:
+        print("⚡ Cache hit - skipping Gemini request")
+        if context is not None:
+            context.add_turn(prompt, cached)
+        # Cached answers are plain text, whichever path stored them
+        yield from chunk_answer(cached)
+        return
+
+    estimated = estimate_tokens(prompt) + (context.token_count() if context else 0)
+    if not scheduler.acquire(estimated, priority=priority, max_wait=max_wait):
+        print("⏳ Rate limiting - using fallback response")
+        yield get_fallback_response(prompt)
+        return
+
+    chunks = []
+    try:
+        buffer = ""
+        pending = ""
+        part = None
+        for part in _send(prompt, context, stream=True):
+            buffer += part.text
+            sentences, buffer = split_sentences(buffer)
+            ready, pending = group_sentences(sentences, pending)
+            for chunk in ready:
+                chunks.append(chunk)
+                yield chunk
+
+        tail = f"{pending} {clean_response(buffer.strip())}".strip()
+        if tail:
+            chunks.append(tail)
+            yield tail
+
+        # The final streamed part carries the usage totals for the whole answer
+        if part is not None:
+            record_usage(estimated, part)
+
+        answer = "\n".join(chunks)
+        if use_cache:
+            response_cache.put(prompt, answer)
+        if context is not None:
+            context.add_turn(prompt, answer)
+    except Exception as e:
+        error_msg = str(e).lower()
+        if "quota exceeded" in error_msg or "rate limit" in error_msg or "429" in error_msg:
+            print("⚠️ Gemini API quota exceeded - using fallback response")
+        else:
+            print(f"❌ Gemini API error: {e}")
+        # Only fall back if nothing was spoken yet, otherwise the answer is just cut short
+        if not chunks:
+            yield get_fallback_response(prompt)
+
+# Canned answers by fallback intent (see intents/registry.py for the keywords)
+FALLBACK_RESPONSES = {
+    "greeting": "வணக்கம்! நான் ஜாரா. உங்களுக்கு எப்படி உதவ முடியும்?",
+    "wellbeing": "நான் நன்றாக இருக்கிறேன்! நீங்கள் எப்படி இருக்கிறீர்கள்?",
+    "name": "என் பெயர் ஜாரா. நான் உங்கள் AI உதவியாளர்.",
+    "gratitude": "நன்றி! உங்களுக்கு மேலும் உதவ வேண்டுமா?",
+    "farewell": "பிரியாவிடை! மீண்டும் சந்திப்போம்.",
+    "music_help": "நீங்கள் எந்த பாடலை கேட்க விரும்புகிறீர்கள்? பாடல் பெயரை சொல்லுங்கள்.",
+    "weather": "மன்னிக்கவும், வானிலை தகவல் தற்போது கிடைக்கவில்லை. பிறகு முயற்சிக்கவும்.",
+    "help": "நான் உங்களுக்கு பாடல்கள் இசைக்க, நேரம் சொல்ல, உரையாடல் நடத்த முடியும். எது வேண்டும்?",
+    "conversation": "நீங்கள் என்ன தெரிந்து கொள்ள விரும்புகிறீர்கள்? தயவுசெய்து மேலும் குறிப்பிட்டு சொல்லுங்கள்.",
+    "yes": "சரி! எது வேண்டும் சொல்லுங்கள்.",
+    "no": "சரி, வேறு ஏதாவது வேண்டுமா?",
+}
+GENERIC_FALLBACK = "மன்னிக்கவும், நான் தற்போது விரிவான பதில்கள் கொடுக்க முடியாது. நீங்கள் பாடல் இசைக்க, நேரம் தெரிந்து கொள்ள, அல்லது எளிய கேள்விகள் கேட்கலாம்."
+
 def get_fallback_response(prompt):
     """Fallback responses when Gemini API is unavailable"""
-    prompt_lower = prompt.lower()
-
-    # Greetings
-    if any(word in prompt_lower for word in ["hello", "hi", "வணக்கம்", "ஹலோ", "hey"]):
-        return "வணக்கம்! நான் ஜாரா. உங்களுக்கு எப்படி உதவ முடியும்?"
-
-    # Well-being
-    elif any(word in prompt_lower for word in ["how are you", "எப்படி இருக்கிறாய்", "how do you do", "நீ எப்படி இருக்கிறாய்"]):
-        return "நான் நன்றாக இருக்கிறேன்! நீங்கள் எப்படி இருக்கிறீர்கள்?"
-
-    # Name queries
-    elif any(word in prompt_lower for word in ["what is your name", "உன் பெயர் என்ன", "who are you", "நீ யார்"]):
-        return "என் பெயர் ஜாரா. நான் உங்கள் AI உதவியாளர்."
-
-    # Gratitude
-    elif any(word in prompt_lower for word in ["thank you", "thanks", "நன்றி", "மிக்க நன்றி"]):
-        return "நன்றி! உங்களுக்கு மேலும் உதவ வேண்டுமா?"
-
-    # Farewell
-    elif any(word in prompt_lower for word in ["bye", "goodbye", "பிரியாவிடை", "சந்திப்போம்", "see you"]):
-        return "பிரியாவிடை! மீண்டும் சந்திப்போம்."
-
-    # Music/Songs
-    elif any(word in prompt_lower for word in ["play", "music", "song", "பாடல்", "இசை", "spotify"]):
-        return "நீங்கள் எந்த பாடலை கேட்க விரும்புகிறீர்கள்? பாடல் பெயரை சொல்லுங்கள்."
+    intent = router.best(prompt, group="fallback")
+    if intent is None:
+        # Generic fallback with helpful hint
+        return GENERIC_FALLBACK
 
-    # Time queries
-    elif any(word in prompt_lower for word in ["time", "clock", "நேரம்", "என்ன நேரம்"]):
-        import datetime
+    # Time and date answers are computed fresh
+    if intent.name == "time":
         now = datetime.datetime.now()
         return f"தற்போதைய நேரம்: {now.strftime('%I:%M %p')}"
-
-    # Date queries
-    elif any(word in prompt_lower for word in ["date", "today", "day", "தேதி", "இன்று"]):
-        import datetime
+    if intent.name == "date":
         now = datetime.datetime.now()
         return f"இன்றைய தேதி: {now.strftime('%B %d, %Y')}"
 
-    # Weather (basic response)
-    elif any(word in prompt_lower for word in ["weather", "வானிலை", "climate", "temperature"]):
-        return "மன்னிக்கவும், வானிலை தகவல் தற்போது கிடைக்கவில்லை. பிறகு முயற்சிக்கவும்."
-
-    # Help/Capabilities
-    elif any(word in prompt_lower for word in ["help", "what can you do", "capabilities", "உதவி", "என்ன செய்ய முடியும்"]):
-        return "நான் உங்களுக்கு பாடல்கள் இசைக்க, நேரம் சொல்ல, உரையாடல் நடத்த முடியும். எது வேண்டும்?"
-
-    # General conversation starters
-    elif any(word in prompt_lower for word in ["tell me", "சொல்லு", "what about", "என்ன நினைக்கிறாய்"]):
-        return "நீங்கள் என்ன தெரிந்து கொள்ள விரும்புகிறீர்கள்? தயவுசெய்து மேலும் குறிப்பிட்டு சொல்லுங்கள்."
-
-    # Yes/No responses
-    elif prompt_lower in ["yes", "yeah", "ஆம்", "சரி", "ok", "okay"]:
-        return "சரி! எது வேண்டும் சொல்லுங்கள்."
-    
-    elif prompt_lower in ["no", "nope", "இல்லை", "வேண்டாம்"]:
-        return "சரி, வேறு ஏதாவது வேண்டுமா?"
-
-    else:
-        # Generic fallback with helpful hint
-        return "மன்னிக்கவும், நான் தற்போது விரிவான பதில்கள் கொடுக்க முடியாது. நீங்கள் பாடல் இசைக்க, நேரம் தெரிந்து கொள்ள, அல்லது எளிய கேள்விகள் கேட்கலாம்."
\ No newline at end of file
+    return FALLBACK_RESPONSES[intent.name]
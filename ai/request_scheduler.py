@@ -0,0 +1,103 @@
+import heapq
+import itertools
+import time
+from collections import deque
+from threading import Condition
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0  # live voice turns
+PRIORITY_TRANSLATION = 5  # interpreter segments: behind live chat, ahead of background work
+PRIORITY_BACKGROUND = 10  # summaries, pre-warming and other non-urgent work
+
+class RequestScheduler:
+    """Token-bucket scheduler for Gemini requests (RPM and TPM) with a bounded priority wait queue"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute, max_queue=32):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self.max_queue = max_queue
+
+        # Buckets start full so the first burst is served immediately
+        self.request_tokens = float(requests_per_minute)
+        self.model_tokens = float(tokens_per_minute)
+        self.last_refill = time.monotonic()
+
+        self.queue = []  # heap of (priority, seq, estimated_tokens)
+        self.seq = itertools.count()
+        self.condition = Condition()
+
+        self.granted = 0
+        self.rejected_full = 0
+        self.rejected_deadline = 0
+        self.wait_times = deque(maxlen=200)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.request_tokens = min(self.rpm, self.request_tokens + elapsed * self.rpm / 60)
+        self.model_tokens = min(self.tpm, self.model_tokens + elapsed * self.tpm / 60)
+
+    def _predicted_wait(self, entry):
+        """Seconds until the buckets could cover this entry and everything queued ahead of it"""
+        ahead = [item for item in self.queue if item < entry]
+        requests_needed = len(ahead) + 1 - self.request_tokens
+        tokens_needed = sum(item[2] for item in ahead) + entry[2] - self.model_tokens
+        return max(0.0, requests_needed * 60 / self.rpm, tokens_needed * 60 / self.tpm)
+
+    def acquire(self, estimated_tokens, priority=PRIORITY_INTERACTIVE, max_wait=10.0):
+        """Wait for a request slot; return False if it cannot be granted within max_wait seconds"""
+        # A single request larger than the whole minute budget can never be served
+        estimated_tokens = min(estimated_tokens, self.tpm)
+        start = time.monotonic()
+        deadline = start + max_wait
+
+        with self.condition:
+            if len(self.queue) >= self.max_queue:
+                self.rejected_full += 1
+                return False
+
+            entry = (priority, next(self.seq), estimated_tokens)
+            heapq.heappush(self.queue, entry)
+            try:
+                while True:
+                    self._refill()
+                    if self.queue[0] == entry and self.request_tokens >= 1 and self.model_tokens >= estimated_tokens:
+                        heapq.heappop(self.queue)
+                        self.request_tokens -= 1
+                        self.model_tokens -= estimated_tokens
+                        self.granted += 1
+                        self.wait_times.append(time.monotonic() - start)
+                        return True
+
+                    wait = self._predicted_wait(entry)
+                    now = time.monotonic()
+                    if now + wait > deadline:
+                        # Give up now instead of sleeping until a deadline we already know we'll miss
+                        self.queue.remove(entry)
+                        heapq.heapify(self.queue)
+                        self.rejected_deadline += 1
+                        return False
+
+                    self.condition.wait(timeout=max(0.01, min(wait, deadline - now)))
+            finally:
+                self.condition.notify_all()
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Correct the token bucket once the real usage of a request is known"""
+        with self.condition:
+            self._refill()
+            self.model_tokens = min(self.tpm, self.model_tokens + estimated_tokens - actual_tokens)
+            self.condition.notify_all()
+
+    def metrics(self):
+        with self.condition:
+            waits = list(self.wait_times)
+            return {
+                "queue_depth": len(self.queue),
+                "granted": self.granted,
+                "rejected_queue_full": self.rejected_full,
+                "rejected_deadline": self.rejected_deadline,
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                "max_wait": max(waits) if waits else 0.0,
+            }
@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+
+CACHE_PATH = os.path.join(os.getcwd(), "response_cache.json")
+SAVE_EVERY = 10  # write to disk after this many new entries
+# Near-duplicate matching is opt-in: "chapter 3" and "chapter 4" look alike to trigrams
+SIMILARITY_THRESHOLD = float(os.environ['ZARA_CACHE_SIMILARITY']) if os.environ.get('ZARA_CACHE_SIMILARITY') else None
+
+# Words that may differ between near-duplicates; every other word and number must match exactly
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "do", "does", "did", "what", "whats", "who",
+    "how", "why", "when", "where", "which", "me", "my", "you", "your", "i", "it", "of", "to", "in",
+    "on", "for", "about", "and", "or", "please", "can", "could", "would", "tell", "say", "pls",
+    "என்ன", "என்று", "ஒரு", "பற்றி", "சொல்லு", "சொல்லுங்கள்", "தயவுசெய்து", "எனக்கு", "நீ", "நீங்கள்",
+}
+
+def normalize_prompt(prompt):
+    """Normalize prompt text so repeated utterances map to the same cache key"""
+    text = unicodedata.normalize("NFC", prompt).casefold()
+    # Drop punctuation by Unicode category; \w would also strip Tamil vowel signs
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def char_ngrams(text, n=3):
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+def anchor_tokens(text):
+    """Numbers and content words; near-duplicates must agree on all of them"""
+    numbers = {f"#{run}" for run in re.findall(r"\d+", text)}
+    return frozenset(numbers | {word for word in text.split() if word not in STOPWORDS})
+
+class ResponseCache:
+    """LRU + TTL cache of Gemini answers keyed on normalized prompt text, persisted to disk"""
+
+    def __init__(self, path=CACHE_PATH, max_entries=500, ttl=24 * 60 * 60,
+                 similarity_threshold=SIMILARITY_THRESHOLD, skip_keywords=()):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # None (the default) disables the near-duplicate (character trigram) tier; use 0.95 or more
+        self.similarity_threshold = similarity_threshold
+        self.skip_keywords = [f" {normalize_prompt(kw)} " for kw in skip_keywords]
+        self.entries = OrderedDict()  # key -> {"response", "created", "ngrams", "anchors"}
+        self.lock = Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.unsaved = 0
+        self.load()
+
+    def is_cacheable(self, key):
+        """Time-sensitive prompts (time/date) must always be answered fresh
+        (keywords match whole words, so "day" doesn't block "birthday")"""
+        padded = f" {key} "
+        return bool(key) and not any(kw in padded for kw in self.skip_keywords)
+
+    def get(self, prompt, record=True):
+        """Cached answer for the prompt; record=False peeks without touching LRU order or stats"""
+        key = normalize_prompt(prompt)
+        if not self.is_cacheable(key):
+            return None
+
+        with self.lock:
+            self._expire()
+            entry = self.entries.get(key)
+            if entry is not None:
+                if record:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                return entry["response"]
+
+            similar_key = self._find_similar(key)
+            if similar_key is not None:
+                if record:
+                    self.entries.move_to_end(similar_key)
+                    self.near_hits += 1
+                return self.entries[similar_key]["response"]
+
+            if record:
+                self.misses += 1
+            return None
+
+    def put(self, prompt, response):
+        key = normalize_prompt(prompt)
+        if not response or not self.is_cacheable(key):
+            return
+
+        with self.lock:
+            self.entries[key] = {
+                "response": response,
+                "created": time.time(),
+                "ngrams": char_ngrams(key),
+                "anchors": anchor_tokens(key),
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+            self.unsaved += 1
+            if self.unsaved >= SAVE_EVERY:
+                self._save()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            }
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        # Entries are in LRU order, not creation order, so check them all
+        expired = [key for key, entry in self.entries.items() if entry["created"] < cutoff]
+        for key in expired:
+            del self.entries[key]
+
+    def _find_similar(self, key):
+        if self.similarity_threshold is None:
+            return None
+
+        grams = char_ngrams(key)
+        anchors = anchor_tokens(key)
+        best_key, best_score = None, self.similarity_threshold
+        for other_key, entry in self.entries.items():
+            # Differing numbers or names mean a different question, however similar the text
+            if entry["anchors"] != anchors:
+                continue
+            other = entry["ngrams"]
+            score = len(grams & other) / len(grams | other)
+            if score >= best_score:
+                best_key, best_score = other_key, score
+        return best_key
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load response cache: {e}")
+            return
+
+        cutoff = time.time() - self.ttl
+        for item in saved:
+            if item["created"] >= cutoff:
+                self.entries[item["key"]] = {
+                    "response": item["response"],
+                    "created": item["created"],
+                    "ngrams": char_ngrams(item["key"]),
+                    "anchors": anchor_tokens(item["key"]),
+                }
+        print(f"💾 Loaded {len(self.entries)} cached responses")
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        data = [
+            {"key": key, "response": entry["response"], "created": entry["created"]}
+            for key, entry in self.entries.items()
+        ]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.unsaved = 0
+        except OSError as e:
+            print(f"⚠️ Could not save response cache: {e}")
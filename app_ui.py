@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import subprocess
 import threading
 import time
 from datetime import datetime
@@ -13,12 +12,18 @@ import streamlit.components.v1 as components
 
 # Import your existing modules
 from voice.speaker import speak
-from voice.listener import listen
+from voice.listener import listen, capture_utterance
+from voice.asr import transcribe
 from ai.gemini_ai import get_response
 from tasks.general_tasks import execute_command
 from translator.speech_input import recognize_speech
 from translator.translator_engine import translate_tamil_to_hindi
 from translator.speech_output import speak_text
+from conversation_logger import log_conversation as log_to_file, conversation_logger, history_store
+from intents import router
+from gesture.service import gesture_service
+
+HISTORY_SESSION = "streamlit"
 
 # Configure Streamlit page
 st.set_page_config(
@@ -48,11 +53,8 @@ def log_conversation(role, message):
         'message': message
     })
     
-    # Also log to file
-    log_path = os.path.join(os.getcwd(), "conversation_log.txt")
-    with open(log_path, "a", encoding="utf-8") as log_file:
-        full_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_file.write(f"[{full_timestamp}] {role}: {message}\n")
+    # Also log to the shared conversation log
+    log_to_file(role, message, session_id=HISTORY_SESSION)
 
 def start_voice_listening():
     """Start voice recognition in a separate thread"""
@@ -62,14 +64,9 @@ def start_voice_listening():
     
     def listen_thread():
         try:
-            recognizer = sr.Recognizer()
-            mic = sr.Microphone()
-            
-            with mic as source:
-                recognizer.adjust_for_ambient_noise(source)
-                audio = recognizer.listen(source, timeout=10)
+            audio = capture_utterance(timeout=10)
             
-            command = recognizer.recognize_google(audio)
+            command = transcribe(audio, language="en-US")
             log_conversation("User", command)
             
             st.session_state.system_status = "Processing"
@@ -147,31 +144,34 @@ def process_command_logic(command):
     if not command:
         return "No command received."
     
+    intent = router.best(command, group="command")
+    intent_name = intent.name if intent else None
+
     # Gesture command
-    if any(kw in command.lower() for kw in ["gesture", "கை சைகை", "open gesture", "start gesture"]):
+    if intent_name == "gesture":
         st.session_state.current_mode = "Gesture Recognition"
         return open_gesture_window()
+    if intent_name == "gesture_stop":
+        st.session_state.current_mode = "Standby"
+        gesture_service.stop()
+        return "Gesture recognition stopped"
     
     # GIF display command
-    if any(kw in command.lower() for kw in ["gif", "show gif", "display gif", "GIF காட்டு", "gif காட்டு"]):
+    if intent_name == "gif":
         st.session_state.current_mode = "GIF Display"
         return "GIF display mode activated"
     
     # Spotify/music command
-    if any(kw in command.lower() for kw in ["play song", "play music", "spotify", "பாடல் இசை", "இசை இசை"]):
+    if intent_name == "music":
         st.session_state.current_mode = "Music Player"
         return handle_music_command(command)
     
     # Direct song search
-    if "play" in command.lower() and len(command.split()) > 1:
-        parts = command.lower().split("play", 1)
-        if len(parts) > 1:
-            song_name = parts[1].strip()
-            if song_name:
-                return search_and_play_song_no_auth(song_name)
+    if intent_name == "play_song":
+        return search_and_play_song_no_auth(intent.remainder())
     
     # Translator command
-    if any(kw in command.lower() for kw in ["translator", "translate", "மொழிபெயர்ப்பு", "tamil to hindi"]):
+    if intent_name == "translator":
         st.session_state.current_mode = "Translator"
         return "Translator mode activated"
     
@@ -181,7 +181,7 @@ def process_command_logic(command):
     
     # Use Gemini AI for other queries
     st.session_state.current_mode = "AI Chat"
-    return get_response(command)
+    return get_response(command, session_id=HISTORY_SESSION)
 
 def handle_music_request():
     """Handle music player request"""
@@ -232,16 +232,13 @@ def handle_gif_request():
     st.info("🎬 GIF display mode activated. Say trigger words like 'hello', 'thank you', 'yes', 'no'")
 
 def open_gesture_window():
-    """Open gesture recognition window"""
+    """Start headless gesture recognition (one shared worker; survives Streamlit reruns)"""
     try:
-        gesture_script_path = os.path.join(os.getcwd(), "gesture", "gesture.py")
-        if os.path.exists(gesture_script_path):
-            subprocess.Popen(["python", gesture_script_path])
-            return "Gesture recognition window opened successfully"
-        else:
-            return "Gesture recognition file not found"
+        if gesture_service.start():
+            return "Gesture recognition started"
+        return "Gesture recognition is already running"
     except Exception as e:
-        return f"Failed to open gesture window: {e}"
+        return f"Failed to start gesture recognition: {e}"
 
 def search_and_play_song_no_auth(song_query):
     """Search and play song without authentication"""
@@ -391,7 +388,7 @@ with col1:
     if st.button("🎵 Play Music", key="music", help="Open music player"):
         handle_music_request()
     
-    if st.button("🤲 Gesture Recognition", key="gesture", help="Open gesture window"):
+    if st.button("🤲 Gesture Recognition", key="gesture", help="Start gesture recognition"):
         handle_gesture_request()
     
     if st.button("🌍 Translator", key="translator", help="Start Tamil-Hindi translator"):
@@ -414,11 +411,15 @@ with col2:
     # Conversation Display
     conversation_container = st.container()
     with conversation_container:
-        if st.session_state.conversation_log:
-            for entry in st.session_state.conversation_log[-10:]:  # Show last 10 messages
-                timestamp = entry.get('timestamp', '')
-                role = entry.get('role', '')
-                message = entry.get('message', '')
+        # Read the panel from the history store so it survives restarts
+        conversation_logger.flush()
+        recent_turns = history_store.recent_turns(
+            HISTORY_SESSION, limit=10, since=st.session_state.get('cleared_at'))  # Show last 10 messages
+        if recent_turns:
+            for entry in recent_turns:
+                timestamp = entry['ts'][11:19]
+                role = entry['role']
+                message = entry['message']
                 
                 if role == "User":
                     st.markdown(f"""
@@ -443,6 +444,12 @@ with col2:
         transcription_placeholder = st.empty()
         transcription_placeholder.info("🎧 Listening... Speak now!")
 
+def gesture_status():
+    status = gesture_service.status()
+    if not status["running"]:
+        return "⏸️ Stopped"
+    return f"✅ Running (last: {status['last_gesture'] or 'none'})"
+
 # Right Column - System Info
 with col3:
     st.markdown("### 📊 System Info")
@@ -455,7 +462,7 @@ with col3:
         "Gemini AI": "✅ Connected",
         "Spotify": "⚠️ Web Only",
         "GIF Display": "✅ Ready",
-        "Gesture Recognition": "📁 File Based",
+        "Gesture Recognition": gesture_status(),
         "Multi-Language Translator": "🌍 Tamil, Telugu, Hindi, English"
     }
     
@@ -471,10 +478,17 @@ with col3:
     st.markdown("#### ⚙️ System")
     if st.button("🗑️ Clear Conversation", key="clear_log"):
         st.session_state.conversation_log = []
+        st.session_state.cleared_at = datetime.now().isoformat(timespec="milliseconds")
         st.rerun()
     
     if st.button("📝 Export Log", key="export_log"):
         export_conversation_log()
+
+    # History search (Tamil, Hindi or English)
+    history_query = st.text_input("🔍 Search history:", key="history_query")
+    if history_query:
+        for entry in history_store.search(history_query, limit=5):
+            st.caption(f"{entry['ts'][:16].replace('T', ' ')} · {entry['role']}: {entry['message'][:120]}")
     
     if st.button("🔄 Refresh", key="refresh"):
         st.rerun()
@@ -0,0 +1,98 @@
+"""
+Speech recognition backend benchmark
+Runs recorded WAV fixtures through each ASR backend and reports latency and
+accuracy (character and word error rate) against reference transcripts.
+
+Fixtures: a directory of <name>.wav files, each with a <name>.txt reference
+transcript next to it. Put them in a subdirectory per language to test several:
+    fixtures/ta-IN/hello.wav, fixtures/ta-IN/hello.txt, fixtures/hi-IN/...
+
+Usage:
+    python bench_asr.py --fixtures fixtures --backends google,vosk
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import speech_recognition as sr
+
+from intents.fuzzy import edit_distance
+from voice.asr import BACKENDS, get_recognizer
+
+def load_fixtures(root, default_language):
+    """[(language, name, AudioData, reference)] for every WAV with a transcript"""
+    fixtures = []
+    for directory, _, files in sorted(os.walk(root)):
+        language = os.path.basename(directory) if directory != root else default_language
+        for name in sorted(files):
+            if not name.endswith(".wav"):
+                continue
+            transcript = os.path.join(directory, name[:-4] + ".txt")
+            if not os.path.exists(transcript):
+                print(f"⚠️ Skipping {name}: no transcript")
+                continue
+            with open(transcript, "r", encoding="utf-8") as f:
+                reference = f.read().strip()
+            with sr.AudioFile(os.path.join(directory, name)) as source:
+                audio = sr.Recognizer().record(source)
+            fixtures.append((language, name, audio, reference))
+    return fixtures
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+def error_rate(reference, hypothesis):
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return edit_distance(reference, hypothesis) / len(reference)
+
+def run_backend(name, fixtures):
+    recognizer = get_recognizer(name)
+    if recognizer.name != name:
+        print(f"❌ {name}: backend unavailable")
+        return
+
+    latencies, cers, wers, failures = [], [], [], 0
+    for language, fixture, audio, reference in fixtures:
+        started = time.perf_counter()
+        try:
+            hypothesis = recognizer.transcribe(audio, language)
+        except (sr.UnknownValueError, sr.RequestError) as e:
+            failures += 1
+            hypothesis = ""
+            print(f"   ⚠️ {fixture}: {type(e).__name__} {e}")
+        latencies.append(time.perf_counter() - started)
+        reference, hypothesis = reference.lower(), hypothesis.lower()
+        cers.append(error_rate(reference, hypothesis))
+        wers.append(error_rate(reference.split(), hypothesis.split()))
+
+    print(f"{name:>8}: p50 {percentile(latencies, 50) * 1000:7.1f} ms | "
+          f"p95 {percentile(latencies, 95) * 1000:7.1f} ms | "
+          f"CER {statistics.mean(cers) * 100:5.1f}% | WER {statistics.mean(wers) * 100:5.1f}% | "
+          f"❌ {failures} failed")
+
+def main():
+    parser = argparse.ArgumentParser(description="ASR backend latency/accuracy benchmark")
+    parser.add_argument('--fixtures', default='fixtures')
+    parser.add_argument('--language', default='ta-IN', help="language for WAVs directly in --fixtures")
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures, args.language)
+    if not fixtures:
+        print(f"❌ No WAV fixtures with transcripts under {args.fixtures}")
+        return
+
+    languages = sorted({language for language, _, _, _ in fixtures})
+    print("=" * 60)
+    print(f"🎧 {len(fixtures)} fixtures ({', '.join(languages)})")
+    print("=" * 60)
+    for name in args.backends.split(","):
+        run_backend(name.strip(), fixtures)
+
+if __name__ == "__main__":
+    main()
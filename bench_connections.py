@@ -0,0 +1,97 @@
+"""
+Connection-burst benchmark for the web UI server
+Opens many Socket.IO clients at once and measures how long each takes to
+connect and to receive the welcome message after sending client_ready.
+
+Usage:
+    python web_ui.py                       # in another terminal
+    python bench_connections.py --clients 50 --url http://localhost:5000
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+import socketio
+
+def run_client(url, results, lock, start_barrier, timeout):
+    client = socketio.Client(reconnection=False)
+    welcomed = threading.Event()
+
+    @client.on('speak_text')
+    def on_speak_text(data):
+        welcomed.set()
+
+    start_barrier.wait()
+    started = time.perf_counter()
+    try:
+        client.connect(url, transports=['websocket'], wait_timeout=timeout)
+        connected = time.perf_counter()
+        client.emit('client_ready')
+        ok = welcomed.wait(timeout)
+        greeted = time.perf_counter()
+    except Exception as e:
+        with lock:
+            results.append({'error': str(e)})
+        return
+    finally:
+        if client.connected:
+            client.disconnect()
+
+    with lock:
+        results.append({
+            'connect': connected - started,
+            'welcome': (greeted - started) if ok else None,
+        })
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+def report(name, values):
+    if not values:
+        print(f"{name:>10}: no samples")
+        return
+    print(f"{name:>10}: p50 {percentile(values, 50) * 1000:7.1f} ms | "
+          f"p95 {percentile(values, 95) * 1000:7.1f} ms | "
+          f"max {max(values) * 1000:7.1f} ms | mean {statistics.mean(values) * 1000:7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Socket.IO connection-burst benchmark")
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args()
+
+    results = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(args.clients)
+    threads = [
+        threading.Thread(target=run_client, args=(args.url, results, lock, start_barrier, args.timeout))
+        for _ in range(args.clients)
+    ]
+
+    burst_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - burst_start
+
+    errors = [r['error'] for r in results if 'error' in r]
+    connects = [r['connect'] for r in results if 'connect' in r]
+    welcomes = [r['welcome'] for r in results if r.get('welcome') is not None]
+
+    print("=" * 60)
+    print(f"🔌 {args.clients} clients against {args.url} in {total:.2f}s")
+    print("=" * 60)
+    report("connect", connects)
+    report("welcome", welcomes)
+    print(f"✅ {len(welcomes)} welcomed | ⏰ {len(connects) - len(welcomes)} timed out | ❌ {len(errors)} errors")
+    for error in errors[:5]:
+        print(f"   ❌ {error}")
+
+if __name__ == "__main__":
+    main()
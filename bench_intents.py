@@ -0,0 +1,103 @@
+"""
+Intent routing microbenchmark
+Replays the User utterances from conversation_log.txt through the old chained
+any(kw in text.lower()) keyword scans and through the compiled intent router,
+checks both pick the same intent and reports per-utterance routing time.
+Also lists the utterances only the phonetic fallback resolves (ASR spellings
+such as ட்ரான்ஸ்லேட்டர்) and what that lookup costs.
+
+Usage:
+    python bench_intents.py --log conversation_log.txt --rounds 200
+"""
+
+import argparse
+import time
+
+from conversation_store import parse_legacy_log
+from intents import INTENTS, router
+
+def legacy_route(text, group):
+    """The old if/elif chains: one substring scan per keyword, first intent in table order wins"""
+    lowered = text.lower()
+    for intent in INTENTS:
+        if intent["group"] != group:
+            continue
+        if intent.get("exact"):
+            if lowered in [kw.lower() for kw in intent["keywords"]]:
+                return intent["name"]
+            continue
+        for kw in intent["keywords"]:
+            kw = kw.lower()
+            if kw in lowered:
+                if intent.get("requires_argument"):
+                    if len(text.split()) < 2 or not lowered.split(kw, 1)[1].strip():
+                        continue
+                return intent["name"]
+    return None
+
+def compiled_route(text, group):
+    # Bypass the router's LRU cache so every call pays the full matching cost
+    for match in router._match(text):
+        if match.group == group:
+            return match.name
+    return None
+
+def fuzzy_route(text, group):
+    for match in router._match_fuzzy(text):
+        if match.group == group:
+            return match.name
+    return None
+
+def time_route(route, utterances, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            route(text, "command")
+            route(text, "fallback")
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent routing microbenchmark")
+    parser.add_argument('--log', default='conversation_log.txt')
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    utterances = [r["message"] for r in parse_legacy_log(args.log) if r["role"] == "User"]
+    if not utterances:
+        print(f"❌ No User utterances found in {args.log}")
+        return
+
+    mismatches = []
+    for text in utterances:
+        for group in ("command", "fallback"):
+            old, new = legacy_route(text, group), compiled_route(text, group)
+            if old != new:
+                mismatches.append((group, text, old, new))
+
+    calls = len(utterances) * 2 * args.rounds
+    legacy = time_route(legacy_route, utterances, args.rounds)
+    compiled = time_route(compiled_route, utterances, args.rounds)
+
+    print("=" * 60)
+    print(f"🧭 {len(utterances)} utterances x {args.rounds} rounds ({calls} routing calls)")
+    print("=" * 60)
+    print(f"    legacy: {legacy / calls * 1e6:8.2f} µs per call")
+    print(f"  compiled: {compiled / calls * 1e6:8.2f} µs per call ({legacy / compiled:.1f}x)")
+    print(f"✅ {len(utterances) * 2 - len(mismatches)} agree | ⚠️ {len(mismatches)} differ")
+    for group, text, old, new in mismatches[:5]:
+        print(f"   ⚠️ [{group}] {text[:50]!r}: legacy={old} compiled={new}")
+
+    # Utterances that used to fall through to Gemini but sound like a command
+    missed = [text for text in utterances if compiled_route(text, "command") is None]
+    rescued = [(text, fuzzy_route(text, "command")) for text in missed]
+    rescued = [(text, name) for text, name in rescued if name]
+    fuzzy = time_route(fuzzy_route, missed, args.rounds) if missed else 0.0
+    fuzzy_calls = len(missed) * 2 * args.rounds
+    print("-" * 60)
+    print(f"🔊 phonetic: {fuzzy / max(fuzzy_calls, 1) * 1e6:8.2f} µs per call over {len(missed)} unmatched utterances")
+    print(f"🎯 {len(rescued)} commands recovered without a Gemini round trip")
+    for text, name in rescued[:10]:
+        print(f"   🎯 {text[:50]!r} -> {name}")
+
+if __name__ == "__main__":
+    main()
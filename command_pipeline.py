@@ -0,0 +1,82 @@
+"""
+Per-session command pipeline for the web UI
+Each connected client gets one worker that processes its commands in order,
+with a bounded queue and a shared cap on how many commands run at once
+"""
+
+import queue
+import threading
+
+MAX_PENDING_COMMANDS = 3  # queued commands per client before new ones are rejected
+MAX_ACTIVE_COMMANDS = 4   # commands processed at the same time across all clients
+
+active_commands = threading.BoundedSemaphore(MAX_ACTIVE_COMMANDS)
+
+class CommandPipeline:
+    """Bounded, in-order command queue for one client session"""
+
+    def __init__(self, handler, start_task, max_pending=MAX_PENDING_COMMANDS):
+        # handler(command, cancel_event) does the actual work
+        self.handler = handler
+        self.commands = queue.Queue(maxsize=max_pending)
+        self.lock = threading.Lock()
+        self.generation = 0  # bumped on every cancel; older queued commands are stale
+        self.cancel_event = threading.Event()
+        self.closed = False
+        start_task(self._worker)
+
+    def submit(self, command):
+        """Queue a command; return False if the client already has too many pending"""
+        if self.closed:
+            return False
+        with self.lock:
+            item = (command, self.generation)
+        try:
+            self.commands.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def cancel(self):
+        """Barge-in: stop the running command and drop everything still queued"""
+        with self.lock:
+            self.generation += 1
+            self.cancel_event.set()
+        dropped = 0
+        while True:
+            try:
+                self.commands.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                break
+        return dropped
+
+    def close(self):
+        self.closed = True
+        self.cancel()
+        # Wake the worker so it can exit
+        try:
+            self.commands.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def pending(self):
+        return self.commands.qsize()
+
+    def _worker(self):
+        while not self.closed:
+            item = self.commands.get()
+            if item is None:
+                break
+
+            command, generation = item
+            with self.lock:
+                if generation != self.generation:
+                    continue  # superseded by a barge-in while it was queued
+                cancel_event = self.cancel_event = threading.Event()
+
+            with active_commands:
+                try:
+                    self.handler(command, cancel_event)
+                except Exception as e:
+                    print(f"❌ Error processing command '{command}': {e}")
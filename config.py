@@ -1,5 +1,6 @@
 import google.generativeai as genai
 import os
+from threading import Lock
 
 # Configure Gemini API key from environment variable
 api_key = os.environ.get('GEMINI_API_KEY')
@@ -7,8 +8,34 @@ if not api_key:
     raise ValueError("GEMINI_API_KEY environment variable is not set")
 genai.configure(api_key=api_key)
 
-def get_model():
-    return genai.GenerativeModel("gemini-2.0-flash-exp")
+# Gemini model name per use case (override with environment variables)
+GEMINI_MODELS = {
+    "chat": os.environ.get('GEMINI_CHAT_MODEL', "gemini-2.0-flash-exp"),
+    "translation": os.environ.get('GEMINI_TRANSLATION_MODEL', "gemini-2.0-flash"),
+}
+
+# Shared model instances - GenerativeModel is safe to call from several threads and
+# reuses the SDK's long-lived client connection, so each use case gets exactly one
+_models = {}
+_models_lock = Lock()
+
+def get_model(use_case="chat"):
+    model = _models.get(use_case)
+    if model is None:
+        with _models_lock:
+            model = _models.get(use_case)
+            if model is None:
+                model = genai.GenerativeModel(GEMINI_MODELS[use_case])
+                _models[use_case] = model
+    return model
+
+# Create every model once at startup instead of on the first user turn
+for _use_case in GEMINI_MODELS:
+    get_model(_use_case)
+
+# Gemini quota used by the request scheduler (defaults match the free tier)
+GEMINI_RPM = int(os.environ.get('GEMINI_RPM', 10))
+GEMINI_TPM = int(os.environ.get('GEMINI_TPM', 250000))
 
 # --- Spotify API Configuration ---
 # Get these credentials from https://developer.spotify.com/dashboard/
@@ -16,8 +43,10 @@ SPOTIFY_CLIENT_ID = os.environ.get('SPOTIFY_CLIENT_ID')
 SPOTIFY_CLIENT_SECRET = os.environ.get('SPOTIFY_CLIENT_SECRET')
 SPOTIFY_REDIRECT_URI = "http://localhost:8080/callback"
 
-if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
-    raise ValueError("SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET environment variables must be set")
+def require_spotify_credentials():
+    """Checked when Spotify is used, so chat and translation start without Spotify credentials"""
+    if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
+        raise ValueError("SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET environment variables must be set")
 
 # Instructions:
 # 1. Go to https://developer.spotify.com/dashboard/
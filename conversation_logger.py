@@ -0,0 +1,167 @@
+"""
+Shared conversation logger
+Messages go into an in-memory ring buffer and a background writer appends them
+to conversation_log.jsonl in batches, rotating and gzip-compressing old files
+"""
+
+import atexit
+import gzip
+import json
+import os
+import shutil
+import threading
+from collections import deque
+from datetime import datetime
+from conversation_store import ConversationStore
+
+LOG_PATH = os.path.join(os.getcwd(), "conversation_log.jsonl")
+BATCH_SIZE = 50           # flush once this many records are waiting
+FLUSH_INTERVAL = 1.0      # ...or after this many seconds
+BUFFER_SIZE = 10000       # ring buffer capacity; oldest records are dropped beyond this
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# fsync policies: "none" leaves it to the OS, "batch" syncs after every batch,
+# "always" writes and syncs every record as soon as it is logged
+FSYNC_POLICY = os.environ.get('ZARA_LOG_FSYNC', 'batch')
+
+def run_blocking(function, *args):
+    """Call function on a real OS thread when gevent has patched threading
+
+    Under the gevent web server the writer "thread" is a greenlet, and fsync or an
+    SQLite commit there would stall every Socket.IO client until it returned
+    """
+    try:
+        from gevent import monkey, get_hub
+    except ImportError:
+        return function(*args)
+    if not monkey.is_module_patched("threading"):
+        return function(*args)
+    return get_hub().threadpool.apply(function, args)
+
+class ConversationLogger:
+    def __init__(self, path=LOG_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 buffer_size=BUFFER_SIZE, fsync_policy=FSYNC_POLICY,
+                 max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT, sinks=()):
+        self.path = path
+        # Extra consumers called with each written batch (e.g. the history store)
+        self.sinks = list(sinks)
+        self.batch_size = 1 if fsync_policy == "always" else batch_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.buffer = deque(maxlen=buffer_size)
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+        self.closed = False
+        self.writer = None
+
+    def log(self, role, message, session_id=None, **fields):
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "session": session_id,
+            "role": role,
+            "message": message,
+            **fields,
+        }
+        with self.condition:
+            if self.writer is None:
+                self._start()
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(record)
+            if len(self.buffer) >= self.batch_size:
+                self.condition.notify()
+
+    def _start(self):
+        self.writer = threading.Thread(target=self._run, name="conversation-logger", daemon=True)
+        self.writer.start()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: len(self.buffer) >= self.batch_size or self.closed,
+                    timeout=self.flush_interval,
+                )
+                batch = list(self.buffer)
+                self.buffer.clear()
+                closed = self.closed
+            if batch:
+                self._write(batch)
+            if closed:
+                break
+
+    def _write(self, batch):
+        with self.write_lock:
+            run_blocking(self._write_batch, batch)
+
+    def _write_batch(self, batch):
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+        try:
+            with open(self.path, "a", encoding="utf-8") as log_file:
+                log_file.write(lines)
+                log_file.flush()
+                if self.fsync_policy != "none":
+                    os.fsync(log_file.fileno())
+                size = log_file.tell()
+            self.written += len(batch)
+            if size >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"⚠️ Could not write conversation log: {e}")
+
+        for sink in self.sinks:
+            try:
+                sink(batch)
+            except Exception as e:
+                print(f"⚠️ Conversation log sink failed: {e}")
+
+    def _rotate(self):
+        """conversation_log.jsonl -> .1.jsonl.gz, shifting older backups up"""
+        base, ext = os.path.splitext(self.path)
+        oldest = f"{base}.{self.backup_count}{ext}.gz"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.backup_count - 1, 0, -1):
+            src = f"{base}.{index}{ext}.gz"
+            if os.path.exists(src):
+                os.replace(src, f"{base}.{index + 1}{ext}.gz")
+
+        with open(self.path, "rb") as src, gzip.open(f"{base}.1{ext}.gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.path)
+
+    def flush(self):
+        """Write everything buffered so far on the calling thread"""
+        with self.condition:
+            batch = list(self.buffer)
+            self.buffer.clear()
+        if batch:
+            self._write(batch)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+            writer = self.writer
+        if writer is not None:
+            writer.join(timeout=5)
+        self.flush()
+
+    def stats(self):
+        with self.condition:
+            return {"buffered": len(self.buffer), "written": self.written, "dropped": self.dropped}
+
+# Every logged turn also lands in the searchable history store
+history_store = ConversationStore()
+conversation_logger = ConversationLogger(sinks=[history_store.add_turns])
+atexit.register(conversation_logger.close)
+
+def log_conversation(role, message, session_id=None, **fields):
+    """Log one conversation turn; extra keyword fields (e.g. latency_ms) are stored as-is"""
+    conversation_logger.log(role, message, session_id=session_id, **fields)
@@ -0,0 +1,251 @@
+"""
+Conversation history store
+SQLite table of turns indexed by (session, ts) for fast "last N turns" queries,
+plus an FTS5 trigram index so Tamil/Hindi/English text can be searched by substring
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+DB_PATH = os.path.join(os.getcwd(), "conversation_history.db")
+LEGACY_SESSION = "legacy"  # turns imported from the old conversation_log.txt
+LOCAL_SESSION = "local"    # live terminal / Streamlit turns, which have no session id
+
+# "[2025-08-05 12:42:16] Assistant: ..." - the old conversation_log.txt format
+LEGACY_LINE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] ([^:]+): ?(.*)$")
+
+def message_digest(message):
+    return hashlib.sha1(message.encode("utf-8")).hexdigest()
+
+class ConversationStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS turns (
+                id INTEGER PRIMARY KEY,
+                session TEXT NOT NULL,
+                ts TEXT NOT NULL,
+                role TEXT NOT NULL,
+                message TEXT NOT NULL,
+                fields TEXT,
+                digest TEXT
+            );
+            CREATE INDEX IF NOT EXISTS turns_session_ts ON turns (session, ts);
+            CREATE INDEX IF NOT EXISTS turns_ts ON turns (ts);
+            CREATE TABLE IF NOT EXISTS imports (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        """)
+        self._add_digests()
+        self.fts = self._create_fts()
+        self.conn.commit()
+
+    def _add_digests(self):
+        """One row per (session, ts, role, message): re-importing a grown log or the live
+        log file only adds turns that aren't stored yet. Upgrades older databases in place"""
+        columns = [row["name"] for row in self.conn.execute("PRAGMA table_info(turns)")]
+        if "digest" not in columns:
+            self.conn.execute("ALTER TABLE turns ADD COLUMN digest TEXT")
+        missing = self.conn.execute("SELECT id, message FROM turns WHERE digest IS NULL").fetchall()
+        if missing:
+            self.conn.executemany("UPDATE turns SET digest = ? WHERE id = ?",
+                                  [(message_digest(row["message"]), row["id"]) for row in missing])
+            # Earlier imports may already have stored a turn twice; keep the first copy
+            self.conn.execute("""
+                DELETE FROM turns WHERE id NOT IN (
+                    SELECT MIN(id) FROM turns GROUP BY session, ts, role, digest
+                )
+            """)
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS turns_unique ON turns (session, ts, role, digest)")
+
+    def _create_fts(self):
+        """Full-text index over messages; returns False if this SQLite has no FTS5"""
+        # The trigram tokenizer matches any script by substring - unicode61 would split
+        # Tamil and Hindi words at every vowel sign
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self.conn.executescript(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+                        message, content='turns', content_rowid='id', tokenize='{tokenizer}'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS turns_ai AFTER INSERT ON turns BEGIN
+                        INSERT INTO turns_fts(rowid, message) VALUES (new.id, new.message);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS turns_ad AFTER DELETE ON turns BEGIN
+                        INSERT INTO turns_fts(turns_fts, rowid, message) VALUES ('delete', old.id, old.message);
+                    END;
+                """)
+                return True
+            except sqlite3.OperationalError:
+                continue
+        print("⚠️ SQLite FTS5 not available - history search will use LIKE")
+        return False
+
+    def add_turns(self, records):
+        """Insert records shaped like conversation_logger entries (ts, session, role, message, ...)
+
+        Turns already stored are skipped; returns how many were new
+        """
+        rows = []
+        for record in records:
+            extra = {k: v for k, v in record.items() if k not in ("ts", "session", "role", "message")}
+            rows.append((
+                record.get("session") or LOCAL_SESSION,
+                record["ts"],
+                record["role"],
+                record["message"],
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+                message_digest(record["message"]),
+            ))
+        with self.lock:
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO turns (session, ts, role, message, fields, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+            self.conn.commit()
+        return cursor.rowcount
+
+    def recent_turns(self, session, limit=10, since=None, before=None):
+        """Last `limit` turns of a session, oldest first (index range scan, no full table read)"""
+        query = "SELECT * FROM turns WHERE session = ?"
+        params = [session]
+        if since:
+            query += " AND ts > ?"
+            params.append(since)
+        if before:
+            query += " AND ts < ?"
+            params.append(before)
+        query += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in reversed(rows)]
+
+    def search(self, text, session=None, limit=20):
+        """Full-text search over all messages, newest first"""
+        text = text.strip()
+        if not text:
+            return []
+
+        # Trigram FTS needs at least three characters; shorter queries use LIKE
+        if self.fts and len(text) >= 3:
+            query = ("SELECT turns.* FROM turns_fts JOIN turns ON turns.id = turns_fts.rowid "
+                     "WHERE turns_fts MATCH ?")
+            params = ['"' + text.replace('"', '""') + '"']
+        else:
+            query = "SELECT * FROM turns WHERE message LIKE ?"
+            params = [f"%{text}%"]
+        if session:
+            query += " AND turns.session = ?" if "turns_fts" in query else " AND session = ?"
+            params.append(session)
+        query += " ORDER BY ts DESC LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def turns_between(self, start, end, session=None):
+        """Turns in a time window, e.g. everything from yesterday"""
+        query = "SELECT * FROM turns WHERE ts >= ? AND ts < ?"
+        params = [start, end]
+        if session:
+            query += " AND session = ?"
+            params.append(session)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY ts", params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def _to_dict(self, row):
+        turn = {"session": row["session"], "ts": row["ts"], "role": row["role"], "message": row["message"]}
+        if row["fields"]:
+            turn.update(json.loads(row["fields"]))
+        return turn
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def parse_legacy_log(path):
+    """Read conversation_log.txt; lines without a [timestamp] prefix continue the previous message"""
+    records = []
+    with open(path, "r", encoding="utf-8") as log_file:
+        for line in log_file:
+            line = line.rstrip("\r\n")
+            match = LEGACY_LINE.match(line)
+            if match:
+                timestamp, role, message = match.groups()
+                records.append({
+                    "ts": datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").isoformat(timespec="milliseconds"),
+                    "session": LEGACY_SESSION,
+                    "role": role.strip(),
+                    "message": message,
+                })
+            elif records:
+                records[-1]["message"] += "\n" + line
+    for record in records:
+        record["message"] = record["message"].strip()
+    return records
+
+def parse_export(path):
+    """Read a zara_conversation_*.json export from app_ui (timestamps there are HH:MM:SS only)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    day = data.get("export_time", datetime.now().isoformat())[:10]
+    return [
+        {
+            "ts": f"{day}T{entry.get('timestamp', '00:00:00')}.000",
+            "session": "export",
+            "role": entry.get("role", ""),
+            "message": entry.get("message", ""),
+        }
+        for entry in data.get("conversation", [])
+    ]
+
+def parse_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def import_file(store, path):
+    """Import a .txt legacy log, a .jsonl conversation log or a .json export; returns turns added"""
+    path = os.path.abspath(path)
+    size = os.path.getsize(path)
+    with store.lock:
+        row = store.conn.execute("SELECT size FROM imports WHERE path = ?", (path,)).fetchone()
+    if row and row["size"] == size:
+        return 0  # already imported and unchanged
+
+    if path.endswith(".jsonl"):
+        records = parse_jsonl(path)
+    elif path.endswith(".json"):
+        records = parse_export(path)
+    else:
+        records = parse_legacy_log(path)
+    count = store.add_turns(records)  # turns from an earlier import or the live logger are skipped
+
+    with store.lock:
+        store.conn.execute("INSERT OR REPLACE INTO imports (path, size) VALUES (?, ?)", (path, size))
+        store.conn.commit()
+    return count
+
+if __name__ == "__main__":
+    import sys
+
+    # python conversation_store.py [conversation_log.txt zara_conversation_*.json ...]
+    paths = sys.argv[1:] or [os.path.join(os.getcwd(), "conversation_log.txt")]
+    store = ConversationStore()
+    for path in paths:
+        count = import_file(store, path)
+        print(f"📥 Imported {count} turns from {path}")
+    store.close()
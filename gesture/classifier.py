@@ -0,0 +1,131 @@
+"""
+Gesture classification
+Finger codes for both hands are looked up in a gesture table loaded from JSON
+(gesture/gestures.json, or GESTURE_CONFIG), and a gesture only counts once it
+wins N of the last M frames, so the label no longer flickers frame to frame.
+"""
+
+import json
+import os
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from gesture.features import landmark_array, finger_states, finger_angles, state_code
+
+GESTURE_CONFIG = os.environ.get('GESTURE_CONFIG', os.path.join(os.path.dirname(__file__), "gestures.json"))
+
+def load_gesture_config(path=GESTURE_CONFIG):
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    debounce = config.get("debounce", {})
+    if debounce.get("required", 1) <= debounce.get("window", 1) // 2:
+        raise ValueError(f"{path}: debounce.required must be more than half of debounce.window")
+    return config
+
+class GestureTable:
+    """(left code, right code) -> gesture name
+
+    "x" in a code matches either finger state; leaving out "left" or "right"
+    matches any hand, or none, on that side
+    """
+
+    def __init__(self, definitions):
+        self.exact = {}
+        self.patterns = []
+        for definition in definitions:
+            left, right = definition.get("left"), definition.get("right")
+            if left is None or right is None or "x" in left + right:
+                self.patterns.append((left, right, definition["name"]))
+            else:
+                self.exact[(left, right)] = definition["name"]
+
+    def match(self, left, right):
+        name = self.exact.get((left, right))
+        if name:
+            return name
+        for left_pattern, right_pattern, name in self.patterns:
+            if self._fits(left_pattern, left) and self._fits(right_pattern, right):
+                return name
+        return None
+
+    def _fits(self, pattern, code):
+        if pattern is None:
+            return True
+        return len(code) == len(pattern) and all(p in ('x', c) for p, c in zip(pattern, code))
+
+class GestureDebouncer:
+    """N-of-M vote with hysteresis: a gesture starts after `required` of the last `window`
+    frames and only ends once it falls below `release` of them"""
+
+    def __init__(self, window=8, required=5, release=2):
+        self.required = required
+        self.release = release
+        self.history = deque(maxlen=window)
+        self.current = None
+
+    def update(self, label):
+        """Feed one frame's label (None for no gesture); returns the events it caused"""
+        self.history.append(label)
+        counts = Counter(label for label in self.history if label)
+        events = []
+        if self.current and counts[self.current] < self.release:
+            events.append(self._event("end", self.current))
+            self.current = None
+        if counts:
+            best, votes = counts.most_common(1)[0]
+            if best != self.current and votes >= self.required:
+                if self.current:
+                    events.append(self._event("end", self.current))
+                self.current = best
+                events.append(self._event("start", best))
+        return events
+
+    def _event(self, kind, gesture):
+        return {"type": kind, "gesture": gesture, "at": time.time()}
+
+class GestureClassifier:
+    """MediaPipe result -> per-frame label -> debounced start/end events"""
+
+    def __init__(self, config=None):
+        config = config or load_gesture_config()
+        self.table = GestureTable(config["gestures"])
+        self.debouncer = GestureDebouncer(**config.get("debounce", {}))
+        angles = config.get("angles", {})
+        self.straight_max = angles.get("straight_max", 40)
+        self.bent_min = angles.get("bent_min", 80)
+        self.points = np.empty((2, 21, 3), np.float32)
+        self.last_label = None
+        self.stats = {"frames": 0, "uncertain": 0, "events": 0}
+
+    @property
+    def gesture(self):
+        return self.debouncer.current
+
+    def label(self, result):
+        """Gesture shown in this frame, "Unknown" for unlisted hand shapes, None for no hands
+
+        A half-bent finger could read either way, so such a frame repeats the last label
+        """
+        if not (result.multi_hand_landmarks and result.multi_handedness):
+            self.last_label = None
+            return None
+        codes = {}
+        for i, hand_landmarks in enumerate(result.multi_hand_landmarks[:2]):
+            hand_label = result.multi_handedness[i].classification[0].label
+            points = landmark_array(hand_landmarks, self.points[i])
+            bends = finger_angles(points)[1:]  # the thumb bends at its base, not its middle joint
+            if np.any((bends > self.straight_max) & (bends < self.bent_min)):
+                self.stats["uncertain"] += 1
+                return self.last_label
+            codes[hand_label] = state_code(finger_states(points, hand_label))
+        self.last_label = self.table.match(codes.get("Left", ""), codes.get("Right", "")) or "Unknown"
+        return self.last_label
+
+    def update(self, label):
+        """Vote with this frame's label; "Unknown" frames count against every gesture"""
+        self.stats["frames"] += 1
+        events = self.debouncer.update(None if label == "Unknown" else label)
+        self.stats["events"] += len(events)
+        return events
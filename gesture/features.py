@@ -0,0 +1,41 @@
+"""
+Landmark features
+Each hand's 21 MediaPipe landmarks become one NumPy array per frame, and the
+per-finger tests run on all five fingers at once instead of attribute by attribute.
+"""
+
+import numpy as np
+
+# Landmark indices per finger: thumb, index, middle, ring, pinky
+TIPS = np.array([4, 8, 12, 16, 20])
+JOINTS = np.array([3, 6, 10, 14, 18])   # the joint each tip is compared with
+BASES = np.array([2, 5, 9, 13, 17])
+
+def landmark_array(hand_landmarks, out=None):
+    """(21, 3) float32 array of normalized x, y, z"""
+    if out is None:
+        out = np.empty((21, 3), np.float32)
+    for i, point in enumerate(hand_landmarks.landmark):
+        out[i] = (point.x, point.y, point.z)
+    return out
+
+def finger_states(points, hand_label):
+    """Boolean array, True where a finger is raised (thumb: pointing away from the palm)"""
+    states = points[TIPS, 1] < points[JOINTS, 1]
+    # The thumb folds sideways, so it is judged on x, mirrored for the other hand
+    if hand_label == 'Right':
+        states[0] = points[4, 0] < points[3, 0]
+    else:
+        states[0] = points[4, 0] > points[3, 0]
+    return states
+
+def finger_angles(points):
+    """Bend at each finger's middle joint in degrees: ~0 straight, 90+ curled"""
+    lower = points[JOINTS, :2] - points[BASES, :2]
+    upper = points[TIPS, :2] - points[JOINTS, :2]
+    cos = np.einsum('ij,ij->i', lower, upper) / (np.linalg.norm(lower, axis=1) * np.linalg.norm(upper, axis=1) + 1e-6)
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+def state_code(states):
+    """"01000"-style code used by the gesture table"""
+    return ''.join('1' if state else '0' for state in states)
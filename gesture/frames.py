@@ -0,0 +1,99 @@
+import threading
+import time
+
+import cv2
+
+RECONNECT_DELAY = 1.0  # seconds before reopening a stream that stopped delivering frames
+
+class FrameGrabber:
+    """Reads a camera stream on its own thread and keeps only the newest frame
+
+    Three preallocated buffers rotate between the reader (writing), the "latest"
+    slot and the consumer, so frames are never copied and a slow consumer simply
+    skips stale frames instead of letting the stream back up into seconds of lag
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.writing = None
+        self.latest = None
+        self.latest_id = 0
+        self.latest_time = 0.0
+        self.lock = threading.Condition()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.stats = {"captured": 0, "dropped": 0, "read_failures": 0, "reconnects": 0}
+        self._delivered_id = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="frame-grabber", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def read(self, reuse=None, timeout=1.0):
+        """(frame_id, captured_at, frame) for a frame newer than the last one read, or None
+
+        Pass the frame you got last time as `reuse` to hand its buffer back for recycling
+        """
+        with self.lock:
+            if self.latest_id <= self._delivered_id:
+                self.lock.wait(timeout)
+            if self.latest_id <= self._delivered_id or self.latest is None:
+                return None
+            frame = self.latest
+            self.latest = reuse
+            self._delivered_id = self.latest_id
+            return self.latest_id, self.latest_time, frame
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.source)
+        # Ask the backend not to queue frames on its side either
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def _run(self):
+        cap = self._open()
+        while not self.stopped.is_set():
+            # Read straight into our spare buffer when its shape still fits
+            if self.writing is not None:
+                ok, frame = cap.read(self.writing)
+            else:
+                ok, frame = cap.read()
+            if not ok or frame is None:
+                self.stats["read_failures"] += 1
+                cap.release()
+                if self.stopped.wait(RECONNECT_DELAY):
+                    break
+                self.stats["reconnects"] += 1
+                cap = self._open()
+                continue
+
+            with self.lock:
+                if self.latest_id > self._delivered_id:
+                    self.stats["dropped"] += 1  # consumer never saw the previous one
+                self.writing, self.latest = self.latest, frame
+                self.latest_id += 1
+                self.latest_time = time.monotonic()
+                self.stats["captured"] += 1
+                self.lock.notify_all()
+        cap.release()
+
+class FramePreprocessor:
+    """Mirror and BGR->RGB conversion into buffers allocated once and reused every frame"""
+
+    def __init__(self):
+        self.flipped = None
+        self.rgb = None
+
+    def process(self, frame):
+        if self.flipped is None or self.flipped.shape != frame.shape:
+            self.flipped = frame.copy()
+            self.rgb = frame.copy()
+        cv2.flip(frame, 1, dst=self.flipped)
+        cv2.cvtColor(self.flipped, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        return self.flipped, self.rgb
@@ -1,72 +1,138 @@
+import os
+import threading
+import time
+
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from gesture.classifier import GestureClassifier
+from gesture.frames import FrameGrabber, FramePreprocessor
+from gesture.inference import AdaptiveHands
+
+# ESP32-CAM MJPEG stream (override with GESTURE_STREAM_URL, or a camera index like "0")
+STREAM_URL = os.environ.get('GESTURE_STREAM_URL', "http://192.168.29.164:81/stream")
+WINDOW_NAME = "Two-Hand Gesture Recognition"
+
+class GestureWorker:
+    """Runs MediaPipe on the newest grabbed frame, never on a backlog"""
+
+    def __init__(self, grabber, display=True, on_event=None):
+        self.grabber = grabber
+        self.display = display
+        self.on_event = on_event  # called with each debounced {"type": "start"|"end", "gesture", "at"}
+        self.classifier = GestureClassifier()
+        self.preprocessor = FramePreprocessor()
+        self.hands = AdaptiveHands(max_num_hands=2, min_detection_confidence=0.75)
+        self.stopped = threading.Event()
+        self.thread = None
+        self.label = None
+        self.result = None
+        # Annotated frame for the window, double-buffered so drawing never races imshow
+        self.shown = None
+        self.spare = None
+        self.shown_lock = threading.Lock()
+        self.stats = {"processed": 0, "fps": 0.0, "latency_ms": 0.0, "inference_ms": 0.0}
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="gesture-worker", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+        self.hands.close()
+
+    def latest_annotated(self):
+        with self.shown_lock:
+            return self.shown
+
+    def _run(self):
+        frame = None
+        window_start = time.monotonic()
+        window_frames = 0
+        while not self.stopped.is_set():
+            grabbed = self.grabber.read(reuse=frame)
+            if grabbed is None:
+                frame = None
+                continue  # stream stalled; the grabber reconnects on its own
+            _, captured_at, frame = grabbed
+
+            flipped, rgb = self.preprocessor.process(frame)
+            started = time.monotonic()
+            result = self.hands.process(rgb, started)
+            finished = time.monotonic()
+            if result is not None:
+                # None means the scheduler skipped this frame and the last answer stands
+                self.result = result
+                self.label = self.classifier.label(result)
+                self.stats["inference_ms"] = (finished - started) * 1000
+            # Skipped frames vote too: the scene hasn't changed, so neither has the gesture
+            for event in self.classifier.update(self.label):
+                self._emit(event)
+
+            self.stats["processed"] += 1
+            self.stats["latency_ms"] = (finished - captured_at) * 1000
+            window_frames += 1
+            if finished - window_start >= 1.0:
+                self.stats["fps"] = window_frames / (finished - window_start)
+                window_start, window_frames = finished, 0
+
+            if self.display:
+                self._publish(flipped)
+
+    @property
+    def gesture(self):
+        return self.classifier.gesture
+
+    def _emit(self, event):
+        if event["type"] == "start":
+            print(f"🤲 Gesture: {event['gesture']}")
+        if self.on_event:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                print(f"❌ Gesture event handler failed: {e}")
+
+    def _publish(self, frame):
+        if self.result is not None and self.result.multi_hand_landmarks:
+            for hand_landmarks in self.result.multi_hand_landmarks:
+                mp.solutions.drawing_utils.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+        if self.gesture or self.label:
+            cv2.putText(frame, f"Gesture: {self.gesture or '...'} ({self.label or 'no hands'})", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
+        grabbed = self.grabber.stats
+        overlay = (f"{self.stats['fps']:.1f} FPS | latency {self.stats['latency_ms']:.0f} ms | "
+                   f"inference {self.stats['inference_ms']:.0f} ms | dropped {grabbed['dropped']} | "
+                   f"skipped {self.hands.stats['static'] + self.hands.stats['budget']}")
+        cv2.putText(frame, overlay, (10, frame.shape[0] - 15), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
 
+        if self.spare is None or self.spare.shape != frame.shape:
+            self.spare = np.empty_like(frame)
+        np.copyto(self.spare, frame)
+        with self.shown_lock:
+            self.shown, self.spare = self.spare, self.shown
 
+def start_gesture(source=STREAM_URL):
+    source = int(source) if str(source).isdigit() else source
+    grabber = FrameGrabber(source).start()
+    worker = GestureWorker(grabber).start()
 
-def start_gesture():
-    # Setup MediaPipe
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(max_num_hands=2, min_detection_confidence=0.75)
-    mp_draw = mp.solutions.drawing_utils
-
-    # Finger detection function
-    def get_finger_status(hand_landmarks, hand_label):
-        status = []
-        # Thumb (x-axis for horizontal detection)
-        if hand_label == 'Right':
-            status.append(1 if hand_landmarks.landmark[4].x < hand_landmarks.landmark[3].x else 0)
-        else:
-            status.append(1 if hand_landmarks.landmark[4].x > hand_landmarks.landmark[3].x else 0)
-        # Index, Middle, Ring, Pinky (y-axis)
-        for tip in [8, 12, 16, 20]:
-            status.append(1 if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[tip - 2].y else 0)
-        return ''.join(map(str, status))
-
-    # Gesture mapping
-    gesture_map = {
-        ("01000", "01000"): "Police",
-        ("01000", "00100"): "Ambulance",
-        ("01100", "01100"): "Fire",
-        ("00001", "00001"): "Sick",
-        ("10000", "10000"): "Water",
-        ("01000", "00000"): "Up",
-        ("00000", "01000"): "Down",
-        ("00001", "01000"): "Danger",
-        ("00100", "00100"): "Stop",
-        ("00010", "00010"): "Wait"
-    }
-
-    # Webcam
-    cap = cv2.VideoCapture("http://192.168.29.164:81/stream")
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
-
-        finger_states = {}
-        if result.multi_hand_landmarks and result.multi_handedness:
-            for i, hand_landmarks in enumerate(result.multi_hand_landmarks):
-                hand_label = result.multi_handedness[i].classification[0].label
-                mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                finger_states[hand_label] = get_finger_status(hand_landmarks, hand_label)
-
-            left = finger_states.get("Left", "")
-            right = finger_states.get("Right", "")
-            gesture = gesture_map.get((left, right), "Unknown")
-
-            cv2.putText(frame, f"Gesture: {gesture}", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 3)
-
-        cv2.imshow("Two-Hand Gesture Recognition", frame)
-        if cv2.waitKey(1) & 0xFF == 27:
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
+    # The window only shows the worker's newest result, so a stalled stream can't freeze it
+    try:
+        while True:
+            frame = worker.latest_annotated()
+            if frame is not None:
+                cv2.imshow(WINDOW_NAME, frame)
+            if cv2.waitKey(15) & 0xFF == 27:
+                break
+    finally:
+        worker.stop()
+        grabber.stop()
+        cv2.destroyAllWindows()
+        print(f"📷 Gesture stats: {grabber.stats} | {worker.stats} | inference {worker.hands.stats} | classifier {worker.classifier.stats}")
 
 # Run the function
-start_gesture()
+if __name__ == "__main__":
+    start_gesture()
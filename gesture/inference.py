@@ -0,0 +1,149 @@
+"""
+Adaptive hand inference
+MediaPipe Hands is the expensive part of the gesture loop, so it only runs when
+it can change the answer: frames are downsampled first, a static scene reuses
+the previous result, and between full-frame detections only a fixed window
+around the hands is searched. CPU budgets are set with the GESTURE_* variables below.
+"""
+
+import os
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+INFERENCE_WIDTH = int(os.environ.get('GESTURE_INFERENCE_WIDTH', 320))       # px; 0 keeps the camera resolution
+MAX_FPS = float(os.environ.get('GESTURE_MAX_FPS', 15))                      # inference budget while the scene moves
+IDLE_FPS = float(os.environ.get('GESTURE_IDLE_FPS', 3))                     # budget while nothing moves and no hands are seen
+MOTION_THRESHOLD = float(os.environ.get('GESTURE_MOTION_THRESHOLD', 2.5))   # mean grey-level change that counts as motion
+REDETECT_EVERY = int(os.environ.get('GESTURE_REDETECT_EVERY', 10))          # ROI-tracked inferences between full detections
+MODEL_COMPLEXITY = int(os.environ.get('GESTURE_MODEL_COMPLEXITY', 0))       # 0 = lite landmark model, 1 = full
+STATIC_REFRESH = 1.0   # seconds a static scene with hands may reuse the last result
+THUMBNAIL_SIZE = (64, 48)
+ROI_MARGIN = 0.5       # fraction of the hand box added on each side; the window stays put until redetection
+ROI_MIN_SIZE = 0.3     # smallest ROI as a fraction of the frame
+
+class MotionDetector:
+    """Mean absolute difference of a tiny greyscale thumbnail against the last analysed frame
+
+    Comparing with the last frame MediaPipe saw, not the previous camera frame,
+    means slow movement still adds up to "moved" eventually
+    """
+
+    def __init__(self, threshold=MOTION_THRESHOLD):
+        self.threshold = threshold
+        self.small = np.empty((THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0], 3), np.uint8)
+        self.grey = np.empty((THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0]), np.uint8)
+        self.diff = np.empty_like(self.grey)
+        self.reference = None
+
+    def moved(self, rgb):
+        cv2.resize(rgb, THUMBNAIL_SIZE, dst=self.small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.small, cv2.COLOR_RGB2GRAY, dst=self.grey)
+        if self.reference is None:
+            return True
+        cv2.absdiff(self.grey, self.reference, dst=self.diff)
+        return cv2.mean(self.diff)[0] >= self.threshold
+
+    def accept(self):
+        """The frame just tested was analysed; later frames are compared with it"""
+        if self.reference is None:
+            self.reference = np.empty_like(self.grey)
+        self.reference, self.grey = self.grey, self.reference
+
+def hand_region(result):
+    """Normalized (x0, y0, x1, y1) box around every detected hand, padded for movement"""
+    xs = [point.x for hand in result.multi_hand_landmarks for point in hand.landmark]
+    ys = [point.y for hand in result.multi_hand_landmarks for point in hand.landmark]
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    pad_x = max((x1 - x0) * ROI_MARGIN, (ROI_MIN_SIZE - (x1 - x0)) / 2)
+    pad_y = max((y1 - y0) * ROI_MARGIN, (ROI_MIN_SIZE - (y1 - y0)) / 2)
+    return (max(0.0, x0 - pad_x), max(0.0, y0 - pad_y), min(1.0, x1 + pad_x), min(1.0, y1 + pad_y))
+
+def map_to_frame(result, region):
+    """Rewrite landmarks found inside a crop to full-frame normalized coordinates"""
+    x0, y0, x1, y1 = region
+    for hand in result.multi_hand_landmarks:
+        for point in hand.landmark:
+            point.x = x0 + point.x * (x1 - x0)
+            point.y = y0 + point.y * (y1 - y0)
+
+class AdaptiveHands:
+    """Drop-in for Hands.process that decides per frame whether and where to look
+
+    process() returns a fresh result, or None when the previous one still stands
+    """
+
+    def __init__(self, width=INFERENCE_WIDTH, max_fps=MAX_FPS, idle_fps=IDLE_FPS,
+                 redetect_every=REDETECT_EVERY, max_num_hands=2, min_detection_confidence=0.75):
+        self.width = width
+        self.max_fps = max_fps
+        self.idle_fps = idle_fps
+        self.redetect_every = redetect_every
+        options = {"max_num_hands": max_num_hands, "min_detection_confidence": min_detection_confidence,
+                   "model_complexity": MODEL_COMPLEXITY}
+        # Separate graphs, so switching between full frames and crops doesn't confuse either tracker.
+        # The crop graph tracks across calls, so its window only moves on a full detection
+        self.detector = mp.solutions.hands.Hands(**options)
+        self.tracker = mp.solutions.hands.Hands(**options)
+        self.motion = MotionDetector()
+        self.small = None
+        self.region = None
+        self.tracked = 0
+        self.last_run = 0.0
+        self.stats = {"frames": 0, "full": 0, "roi": 0, "static": 0, "budget": 0}
+
+    def close(self):
+        self.detector.close()
+        self.tracker.close()
+
+    def process(self, rgb, now=None):
+        now = time.monotonic() if now is None else now
+        self.stats["frames"] += 1
+        small = self._downsample(rgb)
+        moved = self.motion.moved(small)
+        since_last = now - self.last_run
+
+        if not moved and since_last < (STATIC_REFRESH if self.region else 1 / self.idle_fps):
+            self.stats["static"] += 1
+            return None
+        if since_last < 1 / self.max_fps:
+            self.stats["budget"] += 1
+            return None
+        self.last_run = now
+        self.motion.accept()
+
+        if self.region and self.tracked < self.redetect_every:
+            result = self._process_region(small)
+            if result.multi_hand_landmarks:
+                self.tracked += 1
+                return result
+            # Lost the hands inside the ROI; look at the whole frame right away
+
+        self.stats["full"] += 1
+        result = self.detector.process(small)
+        self.tracked = 0
+        self.region = hand_region(result) if result.multi_hand_landmarks else None
+        return result
+
+    def _downsample(self, rgb):
+        height, width = rgb.shape[:2]
+        if not self.width or width <= self.width:
+            return rgb
+        size = (self.width, round(height * self.width / width))
+        if self.small is None or self.small.shape[:2] != (size[1], size[0]):
+            self.small = np.empty((size[1], size[0], 3), np.uint8)
+        cv2.resize(rgb, size, dst=self.small, interpolation=cv2.INTER_AREA)
+        return self.small
+
+    def _process_region(self, small):
+        self.stats["roi"] += 1
+        height, width = small.shape[:2]
+        left, top = int(self.region[0] * width), int(self.region[1] * height)
+        right, bottom = int(self.region[2] * width), int(self.region[3] * height)
+        crop = np.ascontiguousarray(small[top:bottom, left:right])
+        result = self.tracker.process(crop)
+        if result.multi_hand_landmarks:
+            map_to_frame(result, (left / width, top / height, right / width, bottom / height))
+        return result
@@ -0,0 +1,213 @@
+"""
+Gesture service
+One long-lived, headless gesture worker for the assistant. It runs as a child
+process, so MediaPipe never blocks the web server's event loop and a crash there
+can't take the assistant down. The child is started once, restarted if it dies,
+and its debounced gesture events come back as JSON lines to subscribed listeners.
+
+Run the worker on its own with: python -m gesture.service
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+LOCK_PATH = os.path.join(tempfile.gettempdir(), "zara_gesture.lock")
+RESTART_DELAYS = [1, 2, 5, 10, 30]  # seconds before each successive restart of a crashing worker
+STABLE_RUN = 60       # a worker that ran this long resets the restart backoff
+STATS_INTERVAL = 10   # seconds between stats lines from the worker
+STOP_TIMEOUT = 5
+
+def _acquire_lock(path=LOCK_PATH):
+    """Open file holding an exclusive OS lock, or None if another process has it.
+    The OS drops the lock when the holder exits, so a crash never leaves it stuck"""
+    handle = open(path, "a+")
+    try:
+        handle.seek(0)  # msvcrt locks from the current position
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+class GestureService:
+    """Start/stop control and supervision of the single gesture worker"""
+
+    def __init__(self):
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.process = None
+        self.lock_file = None
+        self.running = False
+        self.supervisor = None
+        self.definitions = {}
+        self.stats = {"starts": 0, "restarts": 0, "events": 0, "last_gesture": None, "worker": {}}
+
+    def subscribe(self, listener):
+        """listener(event) is called for every {"type": "start"|"end", "gesture", "at"} event"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def is_running(self):
+        return self.running
+
+    def start(self, source=None):
+        """Start the worker; False if it is already running here or in another process"""
+        with self.lock:
+            if self.running:
+                return False
+            self.lock_file = _acquire_lock()
+            if self.lock_file is None:
+                print("⚠️ Gesture recognition is already running in another process")
+                return False
+            from gesture.classifier import load_gesture_config  # keeps NumPy out of the server until needed
+            self.definitions = {d["name"]: d for d in load_gesture_config()["gestures"]}
+            self.running = True
+            self.supervisor = threading.Thread(target=self._supervise, args=(source,),
+                                               name="gesture-supervisor", daemon=True)
+            self.supervisor.start()
+        return True
+
+    def stop(self):
+        with self.lock:
+            if not self.running:
+                return False
+            self.running = False
+            process = self.process
+        if process:
+            self._terminate(process)
+        if self.supervisor:
+            self.supervisor.join(timeout=STOP_TIMEOUT)
+        with self.lock:
+            if self.lock_file:
+                self.lock_file.close()
+                self.lock_file = None
+        print("🛑 Gesture recognition stopped")
+        return True
+
+    def definition(self, name):
+        """The gestures.json entry for a gesture, with any "say" / "action" fields"""
+        return self.definitions.get(name, {})
+
+    def status(self):
+        return {"running": self.running, **self.stats}
+
+    def _supervise(self, source):
+        failures = 0
+        while self.running:
+            started = time.monotonic()
+            self._run_worker(source)
+            if not self.running:
+                break
+            if time.monotonic() - started >= STABLE_RUN:
+                failures = 0
+            delay = RESTART_DELAYS[min(failures, len(RESTART_DELAYS) - 1)]
+            failures += 1
+            self.stats["restarts"] += 1
+            print(f"⚠️ Gesture worker exited, restarting in {delay}s")
+            deadline = time.monotonic() + delay
+            while self.running and time.monotonic() < deadline:
+                time.sleep(0.2)
+
+    def _run_worker(self, source):
+        command = [sys.executable, "-m", "gesture.service"]
+        if source is not None:
+            command.append(str(source))
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            # UTF-8 and unbuffered, so emoji log lines and events arrive intact and at once
+            env = {**os.environ, "PYTHONIOENCODING": "utf-8", "PYTHONUNBUFFERED": "1"}
+            process = subprocess.Popen(command, cwd=root, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       text=True, encoding="utf-8", bufsize=1)
+        except OSError as e:
+            print(f"❌ Could not start gesture worker: {e}")
+            return
+        with self.lock:
+            self.process = process
+            stopping = not self.running
+        if stopping:
+            self._terminate(process)  # stop() came in while the worker was being launched
+        self.stats["starts"] += 1
+        print("🤲 Gesture recognition started")
+
+        for line in process.stdout:
+            line = line.strip()
+            if not line.startswith("{"):
+                if line:
+                    print(line)  # the worker's own log output
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                print(line)
+                continue
+            if message.get("type") == "stats":
+                self.stats["worker"] = message["stats"]
+            else:
+                self._dispatch(message)
+        process.wait()
+        with self.lock:
+            self.process = None
+
+    def _dispatch(self, event):
+        self.stats["events"] += 1
+        if event["type"] == "start":
+            self.stats["last_gesture"] = event["gesture"]
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"❌ Gesture listener failed: {e}")
+
+    def _terminate(self, process):
+        # Closing stdin asks the worker to shut down cleanly and release the camera
+        try:
+            process.stdin.close()
+            process.wait(timeout=STOP_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+# Shared by main.py, the web UI and the Streamlit UI
+gesture_service = GestureService()
+
+def run_worker(source):
+    """Child process side: recognize headlessly and print events as JSON lines until stdin closes"""
+    from gesture.frames import FrameGrabber
+    from gesture.gesture import GestureWorker
+
+    def publish(message):
+        print(json.dumps(message, ensure_ascii=False), flush=True)
+
+    grabber = FrameGrabber(source).start()
+    worker = GestureWorker(grabber, display=False, on_event=publish).start()
+    stopped = threading.Event()
+
+    def wait_for_parent():
+        sys.stdin.read()  # returns once the service closes the pipe or goes away
+        stopped.set()
+
+    threading.Thread(target=wait_for_parent, name="gesture-parent", daemon=True).start()
+    try:
+        while not stopped.wait(STATS_INTERVAL):
+            if not worker.thread.is_alive():
+                sys.exit(1)  # let the supervisor restart us
+            publish({"type": "stats", "stats": {**worker.stats, "grabber": grabber.stats,
+                                                "inference": worker.hands.stats,
+                                                "classifier": worker.classifier.stats}})
+    finally:
+        worker.stop()
+        grabber.stop()
+
+if __name__ == "__main__":
+    from gesture.gesture import STREAM_URL
+    stream = sys.argv[1] if len(sys.argv) > 1 else STREAM_URL
+    run_worker(int(stream) if stream.isdigit() else stream)
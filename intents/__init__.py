@@ -0,0 +1,7 @@
+from .automaton import AhoCorasick
+from .fuzzy import FuzzyIndex, phonetic_key
+from .registry import INTENTS, TIME_KEYWORDS, DATE_KEYWORDS
+from .router import IntentRouter, IntentMatch, normalize_utterance
+
+# Shared router used by main.py, web_ui.py, tasks.general_tasks and the Gemini fallback table
+router = IntentRouter(INTENTS)
@@ -0,0 +1,53 @@
+from collections import deque
+
+class AhoCorasick:
+    """Multi-keyword matcher: finds every keyword occurrence in one pass over the text"""
+
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, payload)
+        goto = [{}]
+        outputs = [[]]
+        for keyword, payload in keywords:
+            node = 0
+            for ch in keyword:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                node = nxt
+            outputs[node].append((len(keyword), keyword, payload))
+
+        # Breadth-first failure links, folded into a full transition table (a DFA) so the
+        # search loop is a single dict lookup per character with no failure chasing
+        fail = [0] * len(goto)
+        delta = [dict(edges) for edges in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            outputs[node] = outputs[node] + outputs[fail[node]]
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[nxt] = goto[state].get(ch, 0)
+            for ch, nxt in delta[fail[node]].items():
+                delta[node].setdefault(ch, nxt)
+
+        self.delta = delta
+        self.outputs = outputs
+
+    def search(self, text):
+        """Yield (start, end, keyword, payload) for every match, including overlapping ones"""
+        delta = self.delta
+        outputs = self.outputs
+        node = 0
+        for index, ch in enumerate(text):
+            # Every state already includes the root's transitions, so a miss means restart
+            node = delta[node].get(ch, 0)
+            if outputs[node]:
+                end = index + 1
+                for length, keyword, payload in outputs[node]:
+                    yield end - length, end, keyword, payload
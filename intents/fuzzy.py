@@ -0,0 +1,126 @@
+"""
+Phonetic fallback for intent keywords
+Speech recognition spells the same English loan word many ways in Tamil script
+(ட்ரான்ஸ்லேட், டிரான்ஸ்லேட்டர், ...). Both scripts are reduced to a consonant skeleton
+so those variants land on the keyword they were meant to be, without asking Gemini.
+"""
+
+# Tamil letters by the sound class they share with Latin spellings; vowels,
+# vowel signs and the pulli (்) carry no class and are dropped
+TAMIL_CLASSES = {
+    "க": "K", "ங": "N", "ச": "S", "ஞ": "N", "ட": "T", "ண": "N", "த": "T", "ந": "N",
+    "ப": "P", "ம": "M", "ய": "", "ர": "R", "ல": "L", "வ": "V", "ழ": "L", "ள": "L",
+    "ற": "R", "ன": "N", "ஜ": "J", "ஷ": "S", "ஸ": "S", "ஹ": "H",
+}
+
+LATIN_DIGRAPHS = {
+    "sh": "S", "ch": "S", "th": "T", "dh": "T", "ph": "P", "bh": "P",
+    "kh": "K", "gh": "K", "zh": "L", "ng": "N",
+}
+
+LATIN_CLASSES = {
+    "b": "P", "p": "P", "f": "P", "t": "T", "d": "T", "k": "K", "g": "K", "q": "K", "c": "K",
+    "s": "S", "z": "S", "x": "KS", "j": "J", "v": "V", "w": "V", "m": "M", "n": "N",
+    "l": "L", "r": "R", "h": "H",
+}
+
+MIN_KEY_LENGTH = 5    # shorter skeletons ("kasturi" = "gesture") collide with ordinary words
+MIN_EDIT_LENGTH = 7   # one-letter slips are only forgiven on longer skeletons
+
+def phonetic_key(text):
+    """Consonant skeleton of a word or phrase, comparable across Tamil and Latin script"""
+    text = text.lower()
+    classes = []
+    index = 0
+    while index < len(text):
+        pair = text[index:index + 2]
+        if pair in LATIN_DIGRAPHS:
+            classes.append(LATIN_DIGRAPHS[pair])
+            index += 2
+            continue
+        ch = text[index]
+        if ch.isdigit():
+            classes.append(ch)
+        else:
+            classes.append(TAMIL_CLASSES.get(ch) or LATIN_CLASSES.get(ch, ""))
+        index += 1
+
+    # Doubled consonants (ட்ட, "tt") sound like one
+    key = []
+    for cls in "".join(classes):
+        if not key or key[-1] != cls:
+            key.append(cls)
+    return "".join(key)
+
+def edit_distance(a, b):
+    """Optimal string alignment distance (insert, delete, substitute, swap neighbours)"""
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+def deletions(key):
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+class FuzzyIndex:
+    """Keyword skeletons indexed with their one-letter deletions for distance-1 lookups"""
+
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, payload)
+        self.exact = {}    # skeleton -> [(keyword, payload)]
+        self.deleted = {}  # skeleton minus one letter -> {skeleton}
+        self.max_words = 1
+        for keyword, payload in keywords:
+            key = phonetic_key(keyword)
+            if len(key) < MIN_KEY_LENGTH:
+                continue
+            self.exact.setdefault(key, []).append((keyword, payload))
+            self.max_words = max(self.max_words, len(keyword.split()))
+            if len(key) >= MIN_EDIT_LENGTH:
+                for variant in deletions(key):
+                    self.deleted.setdefault(variant, set()).add(key)
+
+    def lookup(self, key):
+        """[(distance, keyword, payload)] for indexed skeletons within one edit of key"""
+        if len(key) < MIN_KEY_LENGTH:
+            return []
+        found = {key: 0} if key in self.exact else {}
+        if len(key) >= MIN_EDIT_LENGTH - 1:
+            candidates = set(self.deleted.get(key, ()))  # key is missing a letter
+            for variant in deletions(key):
+                if variant in self.exact:                 # key has an extra letter
+                    candidates.add(variant)
+                candidates.update(self.deleted.get(variant, ()))  # substituted or swapped
+            for candidate in candidates:
+                if candidate not in found and len(candidate) >= MIN_EDIT_LENGTH and edit_distance(key, candidate) == 1:
+                    found[candidate] = 1
+        return [
+            (distance, keyword, payload)
+            for candidate, distance in found.items()
+            for keyword, payload in self.exact[candidate]
+        ]
+
+    def search(self, text):
+        """Yield (start, end, keyword, payload, distance) for word windows of text that sound like a keyword"""
+        words = []
+        position = 0
+        for word in text.split():
+            start = text.index(word, position)
+            position = start + len(word)
+            words.append((start, position, phonetic_key(word)))
+
+        for first in range(len(words)):
+            key = ""
+            for last in range(first, min(first + self.max_words, len(words))):
+                # Collapse a repeated class across the word boundary, as phonetic_key does for phrases
+                word_key = words[last][2]
+                key += word_key[1:] if key and word_key and key[-1] == word_key[0] else word_key
+                for distance, keyword, payload in self.lookup(key):
+                    yield words[first][0], words[last][1], keyword, payload, distance
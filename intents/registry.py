@@ -0,0 +1,70 @@
+"""
+Declarative intent table
+Order matters: within a group, earlier intents win when several match, which keeps
+the precedence of the old if/elif keyword chains.
+"fuzzy": "whole" limits the phonetic fallback to utterances that sound like the keyword
+as a whole; intents that start the camera, the translator or a browser use it
+"""
+
+# Time-sensitive fallback intents, also used by the response cache to skip caching
+TIME_KEYWORDS = ["time", "clock", "நேரம்", "என்ன நேரம்"]
+DATE_KEYWORDS = ["date", "today", "day", "தேதி", "இன்று"]
+
+INTENTS = [
+    # --- Commands handled by main.py / web_ui.py ---
+    {"name": "gesture_stop", "group": "command", "fuzzy": "whole",
+     "keywords": ["stop gesture", "close gesture", "கை சைகை நிறுத்து", "ஜெஸ்சர் நிறுத்து"]},
+    {"name": "gesture", "group": "command", "fuzzy": "whole",
+     "keywords": ["gesture", "கை சைகை", "open gesture", "start gesture", "ஆக்டிவேட் ஜெஸ்சர்", "activate gesture"]},
+    {"name": "gif", "group": "command",
+     "keywords": ["gif", "show gif", "display gif", "GIF காட்டு", "gif காட்டு"]},
+    {"name": "music", "group": "command",
+     "keywords": ["play song", "play music", "spotify", "பாடல் இசை", "இசை இசை", "song play", "music play",
+                  "ப்ளே மியூசிக்", "மியூசிக் ப்ளே"]},
+    # "play <song name>" - the song name is whatever follows the keyword
+    {"name": "play_song", "group": "command", "keywords": ["play"], "requires_argument": True},
+    {"name": "translator", "group": "command", "fuzzy": "whole",
+     "keywords": ["translator", "translate", "மொழிபெயர்ப்பு", "tamil to hindi", "ஆக்டிவேட் டிரான்ஸ்லேட் மோட்",
+                  "டிரான்ஸ்லேட்"]},
+
+    # --- General tasks handled by tasks.general_tasks.execute_command ---
+    {"name": "open_youtube", "group": "command", "fuzzy": "whole",
+     "keywords": ["open youtube", "யூடியூப்", "யூடியூப் திற"]},
+    {"name": "tell_time", "group": "command",
+     "keywords": ["what is the time", "சமயம் என்ன", "இப்போது நேரம் என்ன"]},
+    {"name": "open_calculator", "group": "command", "fuzzy": "whole",
+     "keywords": ["open calculator", "கார்பன் கால்குலேட்டர் திற", "கார்பன் கால்குலேட்டர்"]},
+    {"name": "open_jayamurugan_portfolio", "group": "command", "fuzzy": "whole",
+     "keywords": ["open Jayamurugan portfolio", "ஓபன் ஜெயமுருகன் போர்ட்ஃபோலியோ", "ஜெயமுருகன்"]},
+    {"name": "open_harishwaran_portfolio", "group": "command", "fuzzy": "whole",
+     "keywords": ["open harishwaran portfolio", "ஓபன் ஹரிஷ்வரன் போர்ட்ஃபோலியோ", "ஹரிஷ்வரன்", "ஹரிஷ் வரன்"]},
+    {"name": "open_tastylens", "group": "command", "fuzzy": "whole",
+     "keywords": ["open Tastylens", "டேஸ்டிலென்ஸ் திற", "டேஸ்டிலென்ஸ்"]},
+
+    # --- Canned answers used by ai.gemini_ai.get_fallback_response ---
+    {"name": "greeting", "group": "fallback",
+     "keywords": ["hello", "hi", "வணக்கம்", "ஹலோ", "hey"]},
+    {"name": "wellbeing", "group": "fallback",
+     "keywords": ["how are you", "எப்படி இருக்கிறாய்", "how do you do", "நீ எப்படி இருக்கிறாய்"]},
+    {"name": "name", "group": "fallback",
+     "keywords": ["what is your name", "உன் பெயர் என்ன", "who are you", "நீ யார்"]},
+    {"name": "gratitude", "group": "fallback",
+     "keywords": ["thank you", "thanks", "நன்றி", "மிக்க நன்றி"]},
+    {"name": "farewell", "group": "fallback",
+     "keywords": ["bye", "goodbye", "பிரியாவிடை", "சந்திப்போம்", "see you"]},
+    {"name": "music_help", "group": "fallback",
+     "keywords": ["play", "music", "song", "பாடல்", "இசை", "spotify"]},
+    {"name": "time", "group": "fallback", "keywords": TIME_KEYWORDS},
+    {"name": "date", "group": "fallback", "keywords": DATE_KEYWORDS},
+    {"name": "weather", "group": "fallback",
+     "keywords": ["weather", "வானிலை", "climate", "temperature"]},
+    {"name": "help", "group": "fallback",
+     "keywords": ["help", "what can you do", "capabilities", "உதவி", "என்ன செய்ய முடியும்"]},
+    {"name": "conversation", "group": "fallback",
+     "keywords": ["tell me", "சொல்லு", "what about", "என்ன நினைக்கிறாய்"]},
+    # Exact intents only fire when the whole utterance is the keyword
+    {"name": "yes", "group": "fallback", "exact": True,
+     "keywords": ["yes", "yeah", "ஆம்", "சரி", "ok", "okay"]},
+    {"name": "no", "group": "fallback", "exact": True,
+     "keywords": ["no", "nope", "இல்லை", "வேண்டாம்"]},
+]
@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+from .automaton import AhoCorasick
+from .fuzzy import FuzzyIndex, phonetic_key
+
+class IntentMatch:
+    """One matched intent with every keyword span found for it in the normalized text"""
+
+    def __init__(self, name, group, rank, text):
+        self.name = name
+        self.group = group
+        self.rank = rank  # position in the intent table; lower wins
+        self.text = text  # the normalized utterance the spans refer to
+        self.spans = []   # [(start, end, keyword)]
+        self.distance = 0  # phonetic edit distance; 0 for exact and same-sounding matches
+        self.fuzzy = False  # True when found by sound rather than by spelling
+
+    @property
+    def start(self):
+        return self.spans[0][0]
+
+    @property
+    def end(self):
+        return self.spans[0][1]
+
+    def remainder(self):
+        """Text after the first matched keyword, e.g. the song name in "play <song>" """
+        return self.text[self.end:].strip()
+
+    def __repr__(self):
+        return f"IntentMatch({self.name!r}, spans={self.spans!r})"
+
+def normalize_utterance(text):
+    return text.lower()
+
+class IntentRouter:
+    """Compiles every intent keyword into one automaton and matches all of them in one pass"""
+
+    def __init__(self, intents):
+        self.intents = intents
+        keywords = []
+        fuzzy_keywords = []
+        whole_keywords = []  # intents with side effects only match by sound when the whole utterance does
+        self.exact = {}
+        for rank, intent in enumerate(intents):
+            for keyword in intent["keywords"]:
+                keyword = normalize_utterance(keyword)
+                if intent.get("exact"):
+                    self.exact.setdefault(keyword, []).append(rank)
+                else:
+                    keywords.append((keyword, rank))
+                    if intent.get("fuzzy") == "whole":
+                        whole_keywords.append((keyword, rank))
+                    elif intent.get("fuzzy", True) and not intent.get("requires_argument"):
+                        fuzzy_keywords.append((keyword, rank))
+        self.automaton = AhoCorasick(keywords)
+        self.fuzzy = FuzzyIndex(fuzzy_keywords)
+        self.fuzzy_whole = FuzzyIndex(whole_keywords)
+        # Several entry points route the same utterance in turn; match it only once
+        self.match = lru_cache(maxsize=256)(self._match)
+        self.match_fuzzy = lru_cache(maxsize=256)(self._match_fuzzy)
+
+    def _match(self, text):
+        """All matching intents, ranked by table order, each with its keyword spans"""
+        normalized = normalize_utterance(text)
+        matches = {}
+
+        for start, end, keyword, rank in self.automaton.search(normalized):
+            match = matches.get(rank)
+            if match is None:
+                intent = self.intents[rank]
+                match = matches[rank] = IntentMatch(intent["name"], intent["group"], rank, normalized)
+            match.spans.append((start, end, keyword))
+
+        # Intents like "play <song>" only count when something follows the keyword
+        for rank, match in list(matches.items()):
+            if self.intents[rank].get("requires_argument") and (
+                    len(normalized.split()) < 2 or not match.remainder()):
+                del matches[rank]
+
+        for rank in self.exact.get(normalized, ()):
+            intent = self.intents[rank]
+            match = matches[rank] = IntentMatch(intent["name"], intent["group"], rank, normalized)
+            match.spans.append((0, len(normalized), normalized))
+
+        ranked = sorted(matches.values(), key=lambda m: m.rank)
+        for match in ranked:
+            match.spans.sort()
+        return tuple(ranked)
+
+    def _match_fuzzy(self, text):
+        """Intents whose keywords sound like a word window of the text, closest first"""
+        normalized = normalize_utterance(text)
+        matches = {}
+
+        found = list(self.fuzzy.search(normalized))
+        found += [(0, len(normalized), keyword, rank, distance)
+                  for distance, keyword, rank in self.fuzzy_whole.lookup(phonetic_key(normalized))]
+        for start, end, keyword, rank, distance in found:
+            match = matches.get(rank)
+            if match is None or distance < match.distance:
+                intent = self.intents[rank]
+                match = matches[rank] = IntentMatch(intent["name"], intent["group"], rank, normalized)
+                match.distance = distance
+                match.fuzzy = True
+            if distance == match.distance:
+                match.spans.append((start, end, keyword))
+
+        ranked = sorted(matches.values(), key=lambda m: (m.distance, m.rank))
+        for match in ranked:
+            match.spans.sort()
+        return tuple(ranked)
+
+    def best(self, text, group=None, allowed=None, fuzzy=True):
+        """Highest-ranked match in a group, optionally limited to the intent names a caller handles
+
+        Spelled matches always win; only when none fits does the phonetic index get a say
+        """
+        sources = (self.match, self.match_fuzzy) if fuzzy else (self.match,)
+        for source in sources:
+            for match in source(text):
+                if group is not None and match.group != group:
+                    continue
+                if allowed is not None and match.name not in allowed:
+                    continue
+                return match
+        return None
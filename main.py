@@ -1,15 +1,24 @@
+import sys
+
+# Web UI mode (the default) runs under gevent, which has to patch before the imports below
+if '--terminal' not in sys.argv:
+    import server_async  # noqa: F401
+
 import os
-import subprocess
-from datetime import datetime
 from voice.speaker import speak
-from voice.listener import listen
+from voice.tts import tts_cache, SYSTEM_PHRASES
+from voice.listener import listen, capture_utterance
+from voice.asr import transcribe
 from ai.gemini_ai import get_response
 from tasks.general_tasks import execute_command
+from conversation_logger import log_conversation
+from intents import router
+from gesture.service import gesture_service
 
 # --- Tamil to Hindi Translator Imports ---
 from translator.speech_input import recognize_speech
-from translator.translator_engine import translate_tamil_to_hindi
-from translator.speech_output import speak_text
+from translator.translation_service import translation_service, LANGUAGE_PAIRS, parse_language_pair
+from translator.interpreter import Interpreter
 
 # --- GIF Display Imports ---
 import speech_recognition as sr
@@ -20,14 +29,7 @@ from PIL import Image, ImageTk, ImageSequence
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 import webbrowser
-from config import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET, SPOTIFY_REDIRECT_URI
-
-# --- Logging Function ---
-def log_conversation(role, message):
-    log_path = os.path.join(os.getcwd(), "conversation_log.txt")
-    with open(log_path, "a", encoding="utf-8") as log_file:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_file.write(f"[{timestamp}] {role}: {message}\n")
+from config import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET, SPOTIFY_REDIRECT_URI, require_spotify_credentials
 
 # --- GIF Display Configuration ---
 speech_to_gif = {
@@ -39,16 +41,12 @@ speech_to_gif = {
 
 def listen_and_show_gif():
     """Listen for speech and display corresponding GIF"""
-    recognizer = sr.Recognizer()
-    mic = sr.Microphone()
-
-    with mic as source:
-        print("🎤 Listening for GIF trigger words...")
-        speak("GIF முறையில் கேட்கிறேன்...")
-        audio = recognizer.listen(source)
+    print("🎤 Listening for GIF trigger words...")
+    speak("GIF முறையில் கேட்கிறேன்...")
+    audio = capture_utterance()
 
     try:
-        command = recognizer.recognize_google(audio).lower()
+        command = transcribe(audio, language="en-US").lower()
         print(f"🗣️ You said: {command}")
         log_conversation("User", command)
         
@@ -116,6 +114,8 @@ def clear_spotify_cache():
 def initialize_spotify():
     """Initialize Spotify client with authentication"""
     try:
+        require_spotify_credentials()
+
         # Clear any existing cache file
         cache_path = ".cache"
         if os.path.exists(cache_path):
@@ -265,17 +265,12 @@ def search_and_play_song(song_query):
 def listen_for_song_request():
     """Listen for song name and search/play it"""
     try:
-        recognizer = sr.Recognizer()
-        mic = sr.Microphone()
-        
         speak("எந்த பாடலை கேட்க விரும்புகிறீர்கள்?")
         print("🎤 Listening for song request...")
         
-        with mic as source:
-            recognizer.adjust_for_ambient_noise(source)
-            audio = recognizer.listen(source, timeout=10)
+        audio = capture_utterance(timeout=10)
         
-        song_query = recognizer.recognize_google(audio)
+        song_query = transcribe(audio, language="en-US")
         print(f"🎵 Song request: {song_query}")
         log_conversation("User", f"Song request: {song_query}")
         
@@ -292,64 +287,54 @@ def listen_for_song_request():
         speak("பாடல் கோரிக்கை புரிந்துகொள்ள முடியவில்லை.")
         return False
 
-# Function to open gesture recognition window
+# Spoken alerts for recognized gestures ("say" entries in gesture/gestures.json)
+def on_gesture(event):
+    if event["type"] != "start":
+        return
+    message = gesture_service.definition(event["gesture"]).get("say")
+    log_conversation("User", f"Gesture: {event['gesture']}")
+    if message:
+        speak(message, wait=False)
+        log_conversation("Assistant", message)
+
+gesture_service.subscribe(on_gesture)
+
+# Function to start headless gesture recognition (one worker, reused until stopped)
 def open_gesture_window():
     try:
-        gesture_script_path = os.path.join(os.getcwd(), "gesture", "gesture.py")
-        if os.path.exists(gesture_script_path):
-            subprocess.Popen(["python", gesture_script_path])
-            speak("கை சைகை விண்டோ திறக்கப்படுகிறது...")
-            log_conversation("Assistant", "கை சைகை விண்டோ திறக்கப்படுகிறது...")
+        if gesture_service.start():
+            speak("கை சைகை அறிதல் தொடங்கப்பட்டது.")
+            log_conversation("Assistant", "கை சைகை அறிதல் தொடங்கப்பட்டது.")
         else:
-            speak("கை சைகை கோப்பு காணவில்லை.")
-            log_conversation("Assistant", "கை சைகை கோப்பு காணவில்லை.")
-            print(f"[ERROR] Gesture file not found: {gesture_script_path}")
+            speak("கை சைகை அறிதல் ஏற்கனவே இயங்குகிறது.")
+            log_conversation("Assistant", "கை சைகை அறிதல் ஏற்கனவே இயங்குகிறது.")
     except Exception as e:
         speak("கை சைகை முறை செயல்படவில்லை.")
         log_conversation("Assistant", "கை சைகை முறை செயல்படவில்லை.")
-        print(f"[ERROR] Failed to open gesture window: {e}")
+        print(f"[ERROR] Failed to start gesture recognition: {e}")
+
+def close_gesture_window():
+    gesture_service.stop()
+    speak("கை சைகை அறிதல் நிறுத்தப்பட்டது.")
+    log_conversation("Assistant", "கை சைகை அறிதல் நிறுத்தப்பட்டது.")
 
 # Multi-language translation loop with language selection
 def translation_loop():
     # Language selection
     speak("மொழிபெயர்ப்பு தேர்வு: தமிழ் to ஹிந்தி, தமிழ் to இங்கிலீஷ், தெலுங்கு to ஹிந்தி, தெலுங்கு to இங்கிலீஷ், ஹிந்தி to இங்கிலீஷ், அல்லது இங்கிலீஷ் to ஹிந்தி எதை விரும்புகிறீர்கள்?")
     print("🌍 Select translation language pair:")
-    print("1. Tamil ➡️ Hindi")
-    print("2. Tamil ➡️ English") 
-    print("3. Telugu ➡️ Hindi")
-    print("4. Telugu ➡️ English")
-    print("5. Hindi ➡️ English")
-    print("6. English ➡️ Hindi")
+    for number, (source, target) in enumerate(LANGUAGE_PAIRS, start=1):
+        print(f"{number}. {source.title()} ➡️ {target.title()}")
     
     while True:
         try:
             selection = recognize_speech().lower()
             log_conversation("User", f"Language selection: {selection}")
             
-            # Parse language selection
-            if any(word in selection for word in ["tamil hindi", "tamil to hindi", "one", "1", "தமிழ் ஹிந்தி"]):
-                source_lang = "tamil"
-                target_lang = "hindi"
-                break
-            elif any(word in selection for word in ["tamil english", "tamil to english", "two", "2", "தமிழ் இங்கிலீஷ்"]):
-                source_lang = "tamil"
-                target_lang = "english"
-                break
-            elif any(word in selection for word in ["telugu hindi", "telugu to hindi", "three", "3", "தெலுங்கு ஹிந்தி"]):
-                source_lang = "telugu"
-                target_lang = "hindi"
-                break
-            elif any(word in selection for word in ["telugu english", "telugu to english", "four", "4", "தெலுங்கு இங்கிலீஷ்"]):
-                source_lang = "telugu"
-                target_lang = "english"
-                break
-            elif any(word in selection for word in ["hindi english", "hindi to english", "five", "5", "ஹிந்தி இங்கிலீஷ்"]):
-                source_lang = "hindi"
-                target_lang = "english"
-                break
-            elif any(word in selection for word in ["english hindi", "english to hindi", "six", "6", "இங்கிலீஷ் ஹிந்தி"]):
-                source_lang = "english"
-                target_lang = "hindi"
+            # Parse language selection against the pair table
+            pair = parse_language_pair(selection)
+            if pair:
+                source_lang, target_lang = pair
                 break
             else:
                 speak("தெளிவான தேர்வு சொல்லுங்கள். எண்ணையும் சொல்லலாம்.")
@@ -372,60 +357,22 @@ def translation_loop():
     log_conversation("Assistant", f"{source_lang.title()} ➡️ {target_lang.title()} translator started")
     print(f"🟢 {source_lang.title()} ➡️ {target_lang.title()} translator running. Say something in {source_lang.title()}.")
     
-    while True:
-        input_text = recognize_speech()
-        log_conversation("User", input_text)
-
-        if input_text.lower() in ["stop", "exit", "niruthu", "நிறுத்து", "நிற்கவும்", "வெளியேறு", "వెలుయే", "रुको", "बंद करो"]:
-            speak("மொழிபெயர்ப்பு நிறுத்தப்பட்டது.")
-            log_conversation("Assistant", "மொழிபெயர்ப்பு நிறுத்தப்பட்டது.")
-            print("🛑 Exiting translator.")
-            break
-
-        if input_text.strip() == "":
-            continue
-
-        print(f"🗣️ {source_lang.title()}: {input_text}")
-        
-        # Use existing translation function or extend for other languages
-        if source_lang == "tamil" and target_lang == "hindi":
-            translated_output = translate_tamil_to_hindi(input_text)
-        else:
-            # For other language pairs, use a generic translation function
-            translated_output = translate_text(input_text, source_lang, target_lang)
-        
-        print(f"📝 {target_lang.title()}: {translated_output}")
-        log_conversation("Assistant", translated_output)
-        speak_text(translated_output)
+    # Capture, recognition, translation and speech overlap, so keep talking while it speaks
+    interpreter = Interpreter(
+        source_lang, target_lang,
+        on_text=lambda text: log_conversation("User", text),
+        on_translation=lambda text: log_conversation("Assistant", text),
+    )
+    interpreter.run()
+
+    speak("மொழிபெயர்ப்பு நிறுத்தப்பட்டது.")
+    log_conversation("Assistant", "மொழிபெயர்ப்பு நிறுத்தப்பட்டது.")
+    print("🛑 Exiting translator.")
 
 def translate_text(text, source_lang, target_lang):
     """Generic translation function for multiple language pairs"""
-    try:
-        # Import translation library (you can use Google Translate API or similar)
-        from googletrans import Translator
-        translator = Translator()
-        
-        # Language code mapping
-        lang_codes = {
-            "tamil": "ta",
-            "telugu": "te", 
-            "hindi": "hi",
-            "english": "en"
-        }
-        
-        source_code = lang_codes.get(source_lang, "ta")
-        target_code = lang_codes.get(target_lang, "hi")
-        
-        result = translator.translate(text, src=source_code, dest=target_code)
-        return result.text
-        
-    except Exception as e:
-        print(f"❌ Translation error: {e}")
-        # Fallback to existing function if available
-        if source_lang == "tamil" and target_lang == "hindi":
-            return translate_tamil_to_hindi(text)
-        else:
-            return f"Translation error for {source_lang} to {target_lang}: {text}"
+    # Translation memory first, then one batched request to the configured engine
+    return translation_service.translate(text, source_lang, target_lang)
 
 # Process user commands
 def process_command(command):
@@ -435,33 +382,35 @@ def process_command(command):
     print(f"[USER COMMAND]: {command}")
     log_conversation("User", command)
 
+    # Match every intent keyword in one pass; the highest-ranked command wins
+    intent = router.best(command, group="command")
+    intent_name = intent.name if intent else None
+
     # If gesture command
-    if any(kw in command.lower() for kw in ["gesture", "கை சைகை", "open gesture", "start gesture", "ஆக்டிவேட் ஜெஸ்சர்", "activate gesture"]):
+    if intent_name == "gesture":
         open_gesture_window()
         return
+    if intent_name == "gesture_stop":
+        close_gesture_window()
+        return
 
     # If GIF display command
-    if any(kw in command.lower() for kw in ["gif", "show gif", "display gif", "GIF காட்டு", "gif காட்டு"]):
+    if intent_name == "gif":
         listen_and_show_gif()
         return
 
     # If Spotify/music command
-    if any(kw in command.lower() for kw in ["play song", "play music", "spotify", "பாடல் இசை", "இசை இசை", "song play", "music play", "ப்ளே மியூசிக்", "மியூசிக் ப்ளே"]):
+    if intent_name == "music":
         listen_for_song_request()
         return
 
     # If direct song search (contains "play" + song name)
-    if "play" in command.lower() and len(command.split()) > 1:
-        # Extract song name after "play"
-        parts = command.lower().split("play", 1)
-        if len(parts) > 1:
-            song_name = parts[1].strip()
-            if song_name:
-                search_and_play_song_no_auth(song_name)  # Use no-auth version
-                return
+    if intent_name == "play_song":
+        search_and_play_song_no_auth(intent.remainder())  # Use no-auth version
+        return
 
     # If user wants translator mode
-    if any(kw in command.lower() for kw in ["translator", "translate", "மொழிபெயர்ப்பு", "tamil to hindi", "ஆக்டிவேட் டிரான்ஸ்லேட் மோட்", "டிரான்ஸ்லேட்"]):
+    if intent_name == "translator":
         translation_loop()
         return
 
@@ -470,8 +419,8 @@ def process_command(command):
         log_conversation("Assistant", "Executed general task command.")
         return
 
-    # If none of the above, use Gemini AI to respond
-    response = get_response(command)
+    # If none of the above, use Gemini AI to respond (terminal mode is one long conversation)
+    response = get_response(command, session_id="terminal")
     log_conversation("Assistant", response)
     speak(response)
 
@@ -483,6 +432,7 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == '--terminal':
         # Terminal mode
         print("🖥️  Running in TERMINAL mode")
+        tts_cache.prewarm(SYSTEM_PHRASES)
         welcome_msg = "வணக்கம்! நான் ஜாரா. இன்று நான் உங்களுக்கு எப்படி உதவ முடியும்?"
         speak(welcome_msg)
         log_conversation("Assistant", welcome_msg)
@@ -0,0 +1,25 @@
+"""
+Async worker setup for the web UI server
+Import this before anything else that touches sockets or threads: when gevent is
+installed it monkey-patches the standard library so every Socket.IO client and
+background task runs as a cheap greenlet instead of blocking a worker thread
+"""
+
+import os
+
+ASYNC_MODE = os.environ.get('ZARA_ASYNC_MODE', 'gevent')
+
+if ASYNC_MODE == 'gevent':
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+
+        # The Gemini SDK talks gRPC, which needs its own hook to cooperate with gevent
+        try:
+            import grpc.experimental.gevent as grpc_gevent
+            grpc_gevent.init_gevent()
+        except ImportError:
+            pass
+    except ImportError:
+        print("⚠️ gevent not installed - falling back to threaded server")
+        ASYNC_MODE = 'threading'
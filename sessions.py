@@ -0,0 +1,74 @@
+"""
+Session registry for the web UI
+Keeps orb state and the command pipeline for each connected Socket.IO client (by sid)
+"""
+
+import threading
+import time
+
+SESSION_IDLE_TIMEOUT = 30 * 60  # seconds without any event before a session is dropped
+
+class Session:
+    def __init__(self, sid, pipeline):
+        self.sid = sid
+        self.status = "ready"
+        self.pipeline = pipeline
+        self.guess = None  # intent guessed from partial transcripts of the utterance in progress
+        self.created = time.time()
+        self.last_active = self.created
+
+    def touch(self):
+        self.last_active = time.time()
+
+class SessionRegistry:
+    """Thread-safe map of sid -> Session with idle expiry"""
+
+    def __init__(self, pipeline_factory, idle_timeout=SESSION_IDLE_TIMEOUT):
+        # pipeline_factory(sid) builds the CommandPipeline for a new session
+        self.pipeline_factory = pipeline_factory
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session(self, sid):
+        """Return the session for sid, creating it if it is new or had expired"""
+        with self.lock:
+            session = self.sessions.get(sid)
+            if session is None:
+                session = Session(sid, self.pipeline_factory(sid))
+                self.sessions[sid] = session
+            session.touch()
+            return session
+
+    def get(self, sid):
+        with self.lock:
+            return self.sessions.get(sid)
+
+    def snapshot(self):
+        """Every current session, copied under the lock so callers can iterate safely"""
+        with self.lock:
+            return list(self.sessions.values())
+
+    def remove(self, sid):
+        with self.lock:
+            session = self.sessions.pop(sid, None)
+        if session:
+            session.pipeline.close()
+        return session
+
+    def expire_idle(self):
+        """Drop sessions idle longer than the timeout; return their sids"""
+        cutoff = time.time() - self.idle_timeout
+        with self.lock:
+            expired = [sid for sid, session in self.sessions.items() if session.last_active < cutoff]
+            sessions = [self.sessions.pop(sid) for sid in expired]
+        for session in sessions:
+            session.pipeline.close()
+        return expired
+
+    def summary(self):
+        with self.lock:
+            states = {}
+            for session in self.sessions.values():
+                states[session.status] = states.get(session.status, 0) + 1
+            return {"active_sessions": len(self.sessions), "states": states}
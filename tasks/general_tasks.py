@@ -1,42 +1,30 @@
 from voice.speaker import speak
+from intents import router
 import webbrowser
 import datetime
 
-def execute_command(command):
-    command = command.lower()
+# Intent name -> (URL to open, spoken confirmation)
+WEBSITE_TASKS = {
+    "open_youtube": ("https://www.youtube.com/", "Opening YouTube"),
+    "open_calculator": ("https://glaze.neocities.org/Ticket/templates/", "Opening Carbon Footprint Calculator"),
+    "open_jayamurugan_portfolio": ("https://jayamurugan-31-portfolio.netlify.app/", "Opening jayamurugan portfolio"),
+    "open_harishwaran_portfolio": ("https://www.harishwaran.tech/", "Opening harishwaran portfolio"),
+    "open_tastylens": ("https://tastylensar.vercel.app/", "Opening Tastylens"),
+}
+TASK_INTENTS = set(WEBSITE_TASKS) | {"tell_time"}
 
-    # YouTube - English & Tamil
-    if "open youtube" in command or "யூடியூப்" in command or "யூடியூப் திற" in command:
-        webbrowser.open("https://www.youtube.com/")
-        speak("Opening YouTube")
-        return True
+def execute_command(command):
+    intent = router.best(command, group="command", allowed=TASK_INTENTS)
+    if intent is None:
+        return False
 
     # Time - English & Tamil
-    if "what is the time" in command or "சமயம் என்ன" in command or "இப்போது நேரம் என்ன" in command:
+    if intent.name == "tell_time":
         now = datetime.datetime.now().strftime("%H:%M")
         speak(f"The time is {now}")
         return True
 
-    # Carbon Footprint Calculator
-    if "open calculator" in command or "கார்பன் கால்குலேட்டர் திற" in command or "கார்பன் கால்குலேட்டர்" in command:
-        webbrowser.open("https://glaze.neocities.org/Ticket/templates/")
-        speak("Opening Carbon Footprint Calculator")
-        return True
-    # Jayamurugan portfolio
-    if "open Jayamurugan portfolio" in command or " ஓபன் ஜெயமுருகன் போர்ட்ஃபோலியோ" in command or "ஜெயமுருகன்" in command:
-        webbrowser.open("https://jayamurugan-31-portfolio.netlify.app/")
-        speak("Opening jayamurugan portfolio")
-        return True
-    if "open harishwaran portfolio" in command or "ஓபன் ஹரிஷ்வரன் போர்ட்ஃபோலியோ" in command or "ஹரிஷ்வரன்" in command or "ஹரிஷ் வரன்" in command:
-        webbrowser.open("https://www.harishwaran.tech/")
-        speak("Opening harishwaran portfolio")
-        return True
-     # Tastylens
-    if "open Tastylens" in command or "டேஸ்டிலென்ஸ் திற" in command or "டேஸ்டிலென்ஸ்" in command:
-        webbrowser.open("https://tastylensar.vercel.app/")
-        speak("Opening Tastylens")
-        return True
-    
-    
-
-    return False
+    url, message = WEBSITE_TASKS[intent.name]
+    webbrowser.open(url)
+    speak(message)
+    return True
@@ -0,0 +1,36 @@
+"""
+Tests for conversation_store.py
+"""
+
+import json
+
+from conversation_store import ConversationStore, import_file, LEGACY_SESSION, LOCAL_SESSION
+
+def sessions(store):
+    return [row["session"] for row in store.conn.execute("SELECT session FROM turns ORDER BY id")]
+
+def test_live_turns_are_not_labelled_as_imported(tmp_path):
+    store = ConversationStore(str(tmp_path / "history.db"))
+    store.add_turns([{"ts": "2025-08-05T12:42:16.123", "session": None, "role": "user", "message": "வணக்கம்"}])
+
+    legacy_log = tmp_path / "conversation_log.txt"
+    legacy_log.write_text("[2025-08-05 12:42:16] User: hello\n", encoding="utf-8")
+    import_file(store, str(legacy_log))
+
+    assert sessions(store) == [LOCAL_SESSION, LEGACY_SESSION]
+    store.close()
+
+def test_reimporting_a_grown_log_adds_only_new_turns(tmp_path):
+    store = ConversationStore(str(tmp_path / "history.db"))
+    first = {"ts": "2025-08-05T12:00:00.000", "session": None, "role": "user", "message": "one"}
+    second = {"ts": "2025-08-05T12:00:01.000", "session": None, "role": "Assistant", "message": "two"}
+    store.add_turns([first])  # already stored by the live logger sink
+
+    log = tmp_path / "conversation_log.jsonl"
+    log.write_text(json.dumps(first) + "\n" + json.dumps(second) + "\n", encoding="utf-8")
+    assert import_file(store, str(log)) == 1
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(json.dumps({**second, "ts": "2025-08-05T12:00:02.000", "message": "three"}) + "\n")
+    assert import_file(store, str(log)) == 1
+    assert len(sessions(store)) == 3
+    store.close()
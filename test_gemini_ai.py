@@ -0,0 +1,60 @@
+"""
+Tests for ai/gemini_ai.py response caching
+Gemini itself is replaced by a fake that answers from the session's history,
+so no API calls are made (a dummy GEMINI_API_KEY is enough).
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from ai import gemini_ai
+from ai.response_cache import ResponseCache
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+def fake_send(prompt, context, stream=False):
+    """Answers with the city the session talked about last, like a real follow-up would"""
+    history = context.history() if context is not None else []
+    city = history[-2]["parts"][0].split()[-1] if history else "nowhere"
+    return FakeResponse(f"About {city}: {prompt}")
+
+@pytest.fixture
+def fake_gemini(monkeypatch, tmp_path):
+    monkeypatch.setattr(gemini_ai, "response_cache", ResponseCache(path=str(tmp_path / "cache.json")))
+    monkeypatch.setattr(gemini_ai, "_send", fake_send)
+    monkeypatch.setattr(gemini_ai.scheduler, "acquire", lambda *args, **kwargs: True)
+    yield
+    for session_id in ("test-chennai", "test-madurai"):
+        gemini_ai.chat_contexts.get(session_id).turns.clear()
+
+def test_follow_up_depends_on_session_history(fake_gemini):
+    gemini_ai.chat_contexts.get("test-chennai").add_turn("tell me about Chennai", "Chennai is a city.")
+    gemini_ai.chat_contexts.get("test-madurai").add_turn("tell me about Madurai", "Madurai is a city.")
+
+    follow_up = "how many people live there"
+    chennai = gemini_ai.get_response(follow_up, session_id="test-chennai")
+    madurai = gemini_ai.get_response(follow_up, session_id="test-madurai")
+
+    assert chennai == f"About Chennai: {follow_up}"
+    assert madurai == f"About Madurai: {follow_up}"
+    assert gemini_ai.response_cache.get(follow_up) is None
+
+def test_standalone_prompt_is_cached(fake_gemini):
+    answer = gemini_ai.get_response("what is the capital of india")
+    assert gemini_ai.response_cache.get("what is the capital of india") == answer
+
+def test_cached_answer_streams_as_sentence_chunks(fake_gemini):
+    # get_response stores whole paragraphs with blank lines between them
+    answer = "Chennai is on the east coast of India.\n\nIt is the capital of Tamil Nadu. It has a long beach.\n\nYes."
+    gemini_ai.response_cache.put("tell me about chennai", answer)
+
+    chunks = list(gemini_ai.stream_response("tell me about chennai"))
+
+    assert chunks == ["Chennai is on the east coast of India.", "It is the capital of Tamil Nadu.",
+                      "It has a long beach.", "Yes."]
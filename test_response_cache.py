@@ -0,0 +1,26 @@
+"""
+Tests for ai/response_cache.py
+"""
+
+from ai.response_cache import ResponseCache
+
+def make_cache(tmp_path, **options):
+    return ResponseCache(path=str(tmp_path / "cache.json"), **options)
+
+def test_time_sensitive_prompts_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path, skip_keywords=["time", "day", "என்ன நேரம்"])
+    for prompt in ["What time is it?", "which day is it", "இப்போ என்ன நேரம்"]:
+        cache.put(prompt, "answer")
+        assert cache.get(prompt) is None
+
+def test_keywords_match_whole_words_only(tmp_path):
+    cache = make_cache(tmp_path, skip_keywords=["time", "day"])
+    for prompt in ["what do people sometimes eat", "birthday cake recipe"]:
+        cache.put(prompt, "answer")
+        assert cache.get(prompt) == "answer"
+
+def test_near_duplicates_need_matching_numbers(tmp_path):
+    cache = make_cache(tmp_path, similarity_threshold=0.5)
+    cache.put("summarize chapter 3 of the book", "chapter three")
+    assert cache.get("summarize chapter 4 of the book") is None
+    assert cache.get("please summarize chapter 3 of the book") == "chapter three"
@@ -0,0 +1,49 @@
+"""
+Tests for translator/translation_service.py
+Engines are replaced by small fakes, so no network or API key is needed.
+"""
+
+import pytest
+
+from translator import translation_service as ts
+
+class EchoEngine:
+    name = "echo"
+
+    def translate_batch(self, texts, source, target):
+        return [text.upper() for text in texts]
+
+class BrokenEngine:
+    name = "broken"
+
+    def translate_batch(self, texts, source, target):
+        raise RuntimeError("engine down")
+
+@pytest.fixture
+def engines(monkeypatch):
+    monkeypatch.setitem(ts.ENGINES, "echo", EchoEngine)
+    monkeypatch.setitem(ts.ENGINES, "broken", BrokenEngine)
+
+def test_translates_with_the_first_working_engine(engines):
+    service = ts.TranslationService(["broken", "echo"], batch_window=0)
+    assert service.translate("vanakkam", "tamil", "english") == "VANAKKAM"
+    assert service.metrics()["failures"] == 1
+
+def test_all_engines_failing_raises_instead_of_returning_error_text(engines):
+    service = ts.TranslationService(["broken"], batch_window=0)
+    with pytest.raises(ts.TranslationError):
+        service.translate("vanakkam", "tamil", "hindi")
+    assert ts.failure_prompt("hindi") == ts.FAILURE_PROMPTS["hindi"]
+
+def test_worker_survives_an_unexpected_error(engines, monkeypatch):
+    service = ts.TranslationService(["echo"], batch_window=0)
+    failures = [ZeroDivisionError("memory broke")]
+
+    def put(*args):
+        if failures:
+            raise failures.pop()
+    monkeypatch.setattr(service.memory, "put", put)
+
+    with pytest.raises(ts.TranslationError):
+        service.submit("one", "tamil", "english").result(timeout=5)
+    assert service.submit("two", "tamil", "english").result(timeout=5) == "TWO"
@@ -0,0 +1,194 @@
+"""
+Simultaneous interpreter
+Capture, recognition, translation and speech run as separate stages joined by
+small bounded queues, so the next utterance is already being captured and
+recognized while the previous translation is still being spoken.
+Use headphones: with a loudspeaker the microphone also hears the translation.
+"""
+
+import queue
+import threading
+import time
+
+import speech_recognition as sr
+
+from translator.translation_service import (translation_service, LANGUAGES, TranslationError, failure_prompt,
+                                            language_code)
+from voice.asr import transcribe
+from voice.listener import capture_utterance
+from voice.speech_pipeline import speech_pipeline
+
+STOP_WORDS = ["stop", "exit", "niruthu", "நிறுத்து", "நிற்கவும்", "வெளியேறு", "వెలుయే", "रुको", "बंद करो"]
+QUEUE_SIZE = 2        # utterances a stage may run ahead of the next one
+CAPTURE_TIMEOUT = 1   # seconds between checks for a stop while waiting for speech
+
+class Utterance:
+    """One spoken sentence and when it passed each stage (time.monotonic())"""
+
+    def __init__(self, number, audio):
+        self.number = number
+        self.audio = audio
+        self.captured = time.monotonic()
+        self.text = ""
+        self.translation = ""
+        self.recognized = None
+        self.translated = None
+        self.speech_started = None
+        self.spoken = None
+
+    def timings(self):
+        """Per-stage milliseconds plus lag from the end of speech to the first translated audio"""
+        ms = lambda start, end: round((end - start) * 1000) if start and end else None
+        return {
+            "recognize_ms": ms(self.captured, self.recognized),
+            "translate_ms": ms(self.recognized, self.translated),
+            "queue_ms": ms(self.translated, self.speech_started),
+            "speak_ms": ms(self.speech_started, self.spoken),
+            "lag_ms": ms(self.captured, self.speech_started),
+        }
+
+class Interpreter:
+    """Concurrent capture -> recognize -> translate -> speak pipeline for one language pair
+
+    On "stop", capture and recognition end at once, but everything already
+    recognized is still translated and spoken
+    """
+
+    def __init__(self, source, target, on_text=None, on_translation=None):
+        self.source = source
+        self.target = target
+        # Optional hooks for conversation logging
+        self.on_text = on_text
+        self.on_translation = on_translation
+        self.stopped = threading.Event()
+        self.audio = queue.Queue(maxsize=QUEUE_SIZE)
+        self.texts = queue.Queue(maxsize=QUEUE_SIZE)
+        self.translations = queue.Queue(maxsize=QUEUE_SIZE)
+        self.translated_all = threading.Event()  # the translate stage has finished
+        self.finished = []
+
+    def run(self):
+        """Interpret until a stop word is heard; returns the finished utterances"""
+        stages = [
+            threading.Thread(target=self._capture, name="interpreter-capture", daemon=True),
+            threading.Thread(target=self._recognize, name="interpreter-recognize", daemon=True),
+            threading.Thread(target=self._translate, name="interpreter-translate", daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+        self._speak()  # the last stage runs on the caller's thread
+        for stage in stages:
+            stage.join(timeout=CAPTURE_TIMEOUT * 2)
+        self._report()
+        return self.finished
+
+    def stop(self):
+        self.stopped.set()
+
+    def _put(self, stage_queue, item, drain=False):
+        """Hand an item to the next stage, giving up if the interpreter stops meanwhile
+        unless drain=True, for stages that still run down their queue after a stop"""
+        while drain or not self.stopped.is_set():
+            try:
+                stage_queue.put(item, timeout=CAPTURE_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, stage_queue, drain=False):
+        """Next item for a stage; after a stop, drain=True still hands out what was already queued"""
+        while not self.stopped.is_set():
+            try:
+                return stage_queue.get(timeout=CAPTURE_TIMEOUT)
+            except queue.Empty:
+                continue
+        if drain:
+            try:
+                return stage_queue.get_nowait()
+            except queue.Empty:
+                pass
+        return None
+
+    def _capture(self):
+        number = 0
+        while not self.stopped.is_set():
+            try:
+                audio = capture_utterance(timeout=CAPTURE_TIMEOUT)
+            except sr.WaitTimeoutError:
+                continue
+            number += 1
+            if not self._put(self.audio, Utterance(number, audio)):
+                break
+
+    def _recognize(self):
+        language = LANGUAGES[self.source]["asr"]
+        while True:
+            utterance = self._get(self.audio)
+            if utterance is None:
+                break
+            try:
+                utterance.text = transcribe(utterance.audio, language=language).strip()
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                print(f"❌ Could not recognize utterance {utterance.number}: {type(e).__name__}")
+                continue
+            utterance.recognized = time.monotonic()
+            utterance.audio = None
+            if not utterance.text:
+                continue
+            if self.on_text:
+                self.on_text(utterance.text)
+            if utterance.text.lower() in STOP_WORDS:
+                self.stop()
+                break
+            print(f"🗣️ {self.source.title()}: {utterance.text}")
+            if not self._put(self.texts, utterance):
+                break
+
+    def _translate(self):
+        # Texts recognized before "stop" are still translated and handed to the speaker
+        try:
+            while True:
+                utterance = self._get(self.texts, drain=True)
+                if utterance is None:
+                    break
+                try:
+                    utterance.translation = translation_service.translate(utterance.text, self.source, self.target)
+                except TranslationError as e:
+                    print(f"❌ Could not translate utterance {utterance.number}: {e}")
+                    utterance.translation = failure_prompt(self.target)  # spoken in the target voice
+                else:
+                    print(f"📝 {self.target.title()}: {utterance.translation}")
+                    if self.on_translation:
+                        self.on_translation(utterance.translation)
+                utterance.translated = time.monotonic()
+                self._put(self.translations, utterance, drain=True)
+        finally:
+            self.translated_all.set()
+
+    def _speak(self):
+        lang = language_code(self.target)
+        while True:
+            # Finish speaking everything recognized before "stop", including translations still in flight
+            utterance = self._get(self.translations, drain=True)
+            if utterance is None:
+                if self.translated_all.is_set() and self.translations.empty():
+                    break
+                self.translated_all.wait(CAPTURE_TIMEOUT)
+                continue
+            speak_called = time.monotonic()
+            report = speech_pipeline.speak(utterance.translation, lang).result()
+            utterance.spoken = time.monotonic()
+            if report and "first_audio_ms" in report:
+                utterance.speech_started = speak_called + report["first_audio_ms"] / 1000
+            else:
+                utterance.speech_started = utterance.spoken  # no audio device: "spoken" when handed over
+            self.finished.append(utterance)
+            timings = utterance.timings()
+            print(f"⏱️ #{utterance.number} recognize {timings['recognize_ms']} ms | translate {timings['translate_ms']} ms | "
+                  f"lag {timings['lag_ms']} ms")
+
+    def _report(self):
+        lags = [u.timings()["lag_ms"] for u in self.finished if u.timings()["lag_ms"] is not None]
+        if lags:
+            print(f"📊 Interpreted {len(lags)} utterances | avg lag {sum(lags) / len(lags):.0f} ms | max lag {max(lags)} ms")
@@ -1,12 +1,13 @@
 import speech_recognition as sr
 
-def recognize_speech():
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("🎤 Listening... (say 'niruthu' to stop)")
-        audio = r.listen(source)
+from voice.asr import transcribe
+from voice.listener import capture_utterance
+
+def recognize_speech(language="ta-IN"):
+    print("🎤 Listening... (say 'niruthu' to stop)")
+    audio = capture_utterance()
     try:
-        return r.recognize_google(audio, language="ta-IN")
+        return transcribe(audio, language=language)
     except sr.UnknownValueError:
         print("❌ Could not understand audio.")
         return ""
@@ -1,19 +1,5 @@
-import os
-import time
-import pygame
-from gtts import gTTS
+from voice.speech_pipeline import speech_pipeline
 
 def speak_text(text, lang='hi'):
-    tts = gTTS(text=text, lang=lang)
-    file_path = os.path.join("assets", "speak.mp3")
-    tts.save(file_path)
-
-    pygame.mixer.init()
-    pygame.mixer.music.load(file_path)
-    pygame.mixer.music.play()
-
-    while pygame.mixer.music.get_busy():
-        time.sleep(0.5)
-
-    pygame.mixer.quit()
-    os.remove(file_path)
+    # Long translations start playing after their first sentence is synthesized
+    return speech_pipeline.speak(text, lang).result()
@@ -0,0 +1,310 @@
+"""
+Translation service
+One entry point for every language pair: a translation memory in front, then
+queued segments batched into a single request to the configured engine
+(Gemini, googletrans or offline Argos), with the others as fallbacks.
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from ai.response_cache import normalize_prompt
+
+# Everything the translator knows about a language, by the name used in main.py
+LANGUAGES = {
+    "tamil":   {"code": "ta", "asr": "ta-IN", "label": "Tamil",   "spoken": ["tamil", "தமிழ்"]},
+    "telugu":  {"code": "te", "asr": "te-IN", "label": "Telugu",  "spoken": ["telugu", "தெலுங்கு"]},
+    "hindi":   {"code": "hi", "asr": "hi-IN", "label": "Hindi",   "spoken": ["hindi", "ஹிந்தி"]},
+    "english": {"code": "en", "asr": "en-IN", "label": "English", "spoken": ["english", "இங்கிலீஷ்"]},
+}
+
+# Pairs offered by the voice translator, in menu order
+LANGUAGE_PAIRS = [
+    ("tamil", "hindi"),
+    ("tamil", "english"),
+    ("telugu", "hindi"),
+    ("telugu", "english"),
+    ("hindi", "english"),
+    ("english", "hindi"),
+]
+NUMBER_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+TAMIL_NUMBER_WORDS = ["ஒன்று", "இரண்டு", "மூன்று", "நான்கு", "ஐந்து", "ஆறு", "ஏழு", "எட்டு", "ஒன்பது"]
+
+def pair_keywords(number, source, target):
+    """Everything a user may say to pick a pair: "tamil to hindi", "தமிழ் ஹிந்தி", "one", "ஒன்று", "1" """
+    keywords = [NUMBER_WORDS[number - 1], TAMIL_NUMBER_WORDS[number - 1], str(number)]
+    for source_name, target_name in zip(LANGUAGES[source]["spoken"], LANGUAGES[target]["spoken"]):
+        keywords += [f"{source_name} {target_name}", f"{source_name} to {target_name}"]
+    return keywords
+
+# (source, target, keywords) built from the tables above
+PAIR_MENU = [
+    (source, target, pair_keywords(number, source, target))
+    for number, (source, target) in enumerate(LANGUAGE_PAIRS, start=1)
+]
+
+def parse_language_pair(selection):
+    """(source, target) named in a spoken selection, or None"""
+    selection = selection.lower()
+    for source, target, keywords in PAIR_MENU:
+        if any(keyword in selection for keyword in keywords):
+            return source, target
+    return None
+
+def language_code(language):
+    return LANGUAGES[language]["code"] if language in LANGUAGES else language
+
+def language_label(language):
+    return LANGUAGES[language]["label"] if language in LANGUAGES else language
+
+# Said or shown instead of a translation when every engine failed
+FAILURE_PROMPTS = {
+    "tamil": "மன்னிக்கவும், மொழிபெயர்க்க முடியவில்லை.",
+    "telugu": "క్షమించండి, అనువదించలేకపోయాను.",
+    "hindi": "माफ़ कीजिए, अनुवाद नहीं हो सका।",
+    "english": "Sorry, I couldn't translate that.",
+}
+
+def failure_prompt(language):
+    return FAILURE_PROMPTS.get(language, FAILURE_PROMPTS["english"])
+
+class TranslationError(Exception):
+    """No engine could translate a segment; callers fall back to failure_prompt()"""
+
+class TranslationMemory:
+    """LRU of finished translations keyed by (source, target, normalized text)"""
+
+    def __init__(self, max_entries=2000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text, source, target):
+        return (language_code(source), language_code(target), normalize_prompt(text))
+
+    def get(self, text, source, target):
+        key = self.key(text, source, target)
+        with self.lock:
+            translation = self.entries.get(key)
+            if translation is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return translation
+
+    def put(self, text, source, target, translation):
+        if not translation:
+            return
+        with self.lock:
+            self.entries[self.key(text, source, target)] = translation
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+TRANSLATION_MAX_WAIT = 3  # seconds a batch waits for Gemini quota before the next engine takes it
+
+class GeminiEngine:
+    """All queued segments of one pair in a single numbered-list prompt"""
+
+    name = "gemini"
+
+    def __init__(self):
+        # Needs GEMINI_API_KEY, so only when this engine is used
+        from config import get_model
+        from ai.gemini_ai import scheduler, record_usage
+        self.model = get_model("translation")
+        self.scheduler = scheduler
+        self.record_usage = record_usage
+
+    def _generate(self, prompt, texts):
+        """One request against the quota shared with chat, queued behind live turns"""
+        from ai.request_scheduler import PRIORITY_TRANSLATION
+        # Prompt plus a translation about as long as the source text (~4 characters per token)
+        estimated = (len(prompt) + sum(len(text) for text in texts)) // 4
+        if not self.scheduler.acquire(estimated, priority=PRIORITY_TRANSLATION, max_wait=TRANSLATION_MAX_WAIT):
+            raise RuntimeError("Gemini quota busy")
+        response = self.model.generate_content(prompt)
+        self.record_usage(estimated, response)
+        return response.text
+
+    def translate_batch(self, texts, source, target):
+        source_label, target_label = language_label(source), language_label(target)
+        if len(texts) == 1:
+            prompt = f"Translate this {source_label} sentence to {target_label} without explanation: '{texts[0]}'"
+            return [self._generate(prompt, texts).strip()]
+
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, start=1))
+        prompt = (
+            f"Translate each numbered {source_label} line to {target_label} without explanation. "
+            f"Reply with exactly {len(texts)} lines using the same numbering.\n\n{numbered}"
+        )
+        lines = {}
+        for line in self._generate(prompt, texts).splitlines():
+            match = re.match(r"\s*(\d+)[.)]\s*(.+)", line)
+            if match:
+                lines[int(match.group(1))] = match.group(2).strip()
+        if sorted(lines) != list(range(1, len(texts) + 1)):
+            raise ValueError(f"batch reply had {len(lines)} of {len(texts)} lines")
+        return [lines[i] for i in range(1, len(texts) + 1)]
+
+class GoogletransEngine:
+    """Unofficial Google Translate client, created once and reused"""
+
+    name = "googletrans"
+
+    def __init__(self):
+        from googletrans import Translator
+        self.translator = Translator()
+        self.lock = threading.Lock()  # the client's HTTP session is not thread-safe
+
+    def translate_batch(self, texts, source, target):
+        with self.lock:
+            results = self.translator.translate(texts, src=language_code(source), dest=language_code(target))
+        return [result.text for result in results]
+
+class ArgosEngine:
+    """Offline translation with installed Argos Translate packages (pivots through English)"""
+
+    name = "argos"
+
+    def __init__(self):
+        import argostranslate.translate
+        self.argos = argostranslate.translate
+
+    def translate_batch(self, texts, source, target):
+        return [self.argos.translate(text, language_code(source), language_code(target)) for text in texts]
+
+ENGINES = {
+    "gemini": GeminiEngine,
+    "googletrans": GoogletransEngine,
+    "argos": ArgosEngine,
+}
+
+TRANSLATION_ENGINES = os.environ.get('ZARA_TRANSLATION_ENGINES', "gemini,googletrans").split(",")
+BATCH_WINDOW = 0.05  # seconds a segment waits for others to share its request
+BATCH_MAX = 8
+ENGINE_RETRY = 300  # seconds before an engine that failed to start is tried again
+
+class TranslationService:
+    """Translation memory, then batched requests to the first engine that works"""
+
+    def __init__(self, engine_names=TRANSLATION_ENGINES, batch_window=BATCH_WINDOW, batch_max=BATCH_MAX):
+        self.engine_names = [name.strip() for name in engine_names if name.strip()]
+        self.engines = {}
+        self.broken = {}  # engine name -> when it failed to start
+        self.batch_window = batch_window
+        self.batch_max = batch_max
+        self.memory = TranslationMemory()
+        self.segments = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stats = {"requests": 0, "segments": 0, "failures": 0}
+
+    def translate(self, text, source, target):
+        """The translation; raises TranslationError when no engine could make one"""
+        return self.submit(text, source, target).result()
+
+    def submit(self, text, source, target):
+        """Future with the translation (or TranslationError); memory hits resolve immediately"""
+        done = Future()
+        text = text.strip()
+        cached = self.memory.get(text, source, target) if text else text
+        if cached is not None:
+            done.set_result(cached)
+            return done
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="translation", daemon=True)
+                self.thread.start()
+        self.segments.put((text, source, target, done))
+        return done
+
+    def metrics(self):
+        return {**self.stats, "memory_entries": len(self.memory.entries),
+                "memory_hits": self.memory.hits, "memory_misses": self.memory.misses,
+                "broken_engines": sorted(self.broken)}
+
+    def _engine(self, name):
+        """Shared engine instance, or None while one that failed to start is backing off"""
+        engine = self.engines.get(name)
+        if engine is None:
+            failed_at = self.broken.get(name)
+            if failed_at is not None and time.monotonic() - failed_at < ENGINE_RETRY:
+                return None
+            try:
+                engine = self.engines[name] = ENGINES[name]()
+            except Exception as e:
+                self.broken[name] = time.monotonic()
+                print(f"❌ Translation engine {name} unavailable for {ENGINE_RETRY}s: {e}")
+                return None
+            self.broken.pop(name, None)
+        return engine
+
+    def _run(self):
+        while True:
+            batch = [self.segments.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_max:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.segments.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            groups = {}
+            for segment in batch:
+                groups.setdefault((segment[1], segment[2]), []).append(segment)
+            for (source, target), segments in groups.items():
+                try:
+                    self._translate_group(source, target, segments)
+                except Exception as e:
+                    # This thread serves every caller, so one bad group must not end it
+                    print(f"❌ Translation worker error: {e}")
+                    for _, _, _, done in segments:
+                        if not done.done():
+                            done.set_exception(TranslationError(str(e)))
+
+    def _translate_group(self, source, target, segments):
+        # The same sentence queued twice is only translated once
+        texts = list(dict.fromkeys(text for text, _, _, _ in segments))
+        translations = self._call_engines(texts, source, target)
+        if translations is None:
+            for _, _, _, done in segments:
+                done.set_exception(TranslationError(f"no engine could translate {source} to {target}"))
+            return
+        by_text = dict(zip(texts, translations))
+        for text, _, _, done in segments:
+            self.memory.put(text, source, target, by_text[text])
+            done.set_result(by_text[text])
+
+    def _call_engines(self, texts, source, target):
+        for name in self.engine_names:
+            engine = self._engine(name)
+            if engine is None:
+                continue
+            try:
+                self.stats["requests"] += 1
+                self.stats["segments"] += len(texts)
+                try:
+                    return engine.translate_batch(texts, source, target)
+                except ValueError:
+                    if len(texts) == 1:
+                        raise
+                    # The batch reply didn't line up; ask for each segment on its own
+                    return [engine.translate_batch([text], source, target)[0] for text in texts]
+            except Exception as e:
+                self.stats["failures"] += 1
+                print(f"❌ Translation error ({name}): {e}")
+        return None
+
+# Shared by main.py, the Streamlit UI and the stand-alone translator
+translation_service = TranslationService()
@@ -0,0 +1,122 @@
+"""
+Speech recognition backends
+Every backend takes sr.AudioData and a language code ("ta-IN", "hi-IN", "te-IN", "en-IN")
+and raises sr.UnknownValueError / sr.RequestError like recognize_google, so callers
+don't care which one is active. Pick one with ZARA_ASR_BACKEND=google|vosk.
+"""
+
+import json
+import os
+
+import speech_recognition as sr
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+ASR_BACKEND = os.environ.get('ZARA_ASR_BACKEND', 'google')
+# One unpacked Vosk model per language: models/vosk/ta-IN, models/vosk/hi-IN, ...
+VOSK_MODEL_DIR = os.environ.get('ZARA_VOSK_MODEL_DIR', os.path.join("models", "vosk"))
+VOSK_SAMPLE_RATE = 16000
+
+class GoogleRecognizer:
+    """The free Google web endpoint used so far (network, no partial results)"""
+
+    name = "google"
+    streaming = False
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio, language):
+        return self.recognizer.recognize_google(audio, language=language)
+
+class VoskStream:
+    """Incremental recognition of one utterance; feed raw 16 kHz 16-bit mono frames"""
+
+    def __init__(self, model):
+        self.recognizer = vosk.KaldiRecognizer(model, VOSK_SAMPLE_RATE)
+        self.text = []
+
+    def accept(self, data):
+        """Feed audio and return the best guess so far for the whole utterance"""
+        if self.recognizer.AcceptWaveform(data):
+            # Vosk finished a segment on its own; keep it and start the next one
+            self.text.append(json.loads(self.recognizer.Result()).get("text", ""))
+            return " ".join(t for t in self.text if t)
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(t for t in self.text + [partial] if t)
+
+    def final(self):
+        self.text.append(json.loads(self.recognizer.FinalResult()).get("text", ""))
+        text = " ".join(t for t in self.text if t).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+class VoskRecognizer:
+    """Offline CPU recognizer with streaming partial results"""
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_dir=VOSK_MODEL_DIR):
+        if vosk is None:
+            raise RuntimeError("vosk is not installed (pip install vosk)")
+        vosk.SetLogLevel(-1)
+        self.model_dir = model_dir
+        self.models = {}
+
+    def model_path(self, language):
+        """Exact language code first, then any model for the same language (en-US -> en-IN)"""
+        candidates = [language]
+        if os.path.isdir(self.model_dir):
+            prefix = language.split("-")[0].lower()
+            candidates += sorted(name for name in os.listdir(self.model_dir)
+                                 if name.split("-")[0].lower() == prefix)
+        for name in candidates:
+            path = os.path.join(self.model_dir, name)
+            if os.path.isdir(path):
+                return path
+        raise sr.RequestError(f"No Vosk model for {language} in {self.model_dir}")
+
+    def model(self, language):
+        model = self.models.get(language)
+        if model is None:
+            # Loading takes seconds, so each model is loaded once and kept
+            model = self.models[language] = vosk.Model(self.model_path(language))
+        return model
+
+    def stream(self, language):
+        return VoskStream(self.model(language))
+
+    def transcribe(self, audio, language):
+        stream = self.stream(language)
+        stream.accept(audio.get_raw_data(convert_rate=VOSK_SAMPLE_RATE, convert_width=2))
+        return stream.final()
+
+BACKENDS = {
+    "google": GoogleRecognizer,
+    "vosk": VoskRecognizer,
+}
+
+_recognizers = {}
+
+def get_recognizer(name=None):
+    """Shared backend instance; falls back to Google if the offline one can't start"""
+    name = name or ASR_BACKEND
+    recognizer = _recognizers.get(name)
+    if recognizer is None:
+        try:
+            recognizer = BACKENDS[name]()
+        except Exception as e:
+            if name == "google":
+                raise
+            print(f"⚠️ ASR backend '{name}' unavailable ({e}), using Google")
+            return get_recognizer("google")
+        _recognizers[name] = recognizer
+    return recognizer
+
+def transcribe(audio, language="ta-IN"):
+    return get_recognizer().transcribe(audio, language)
@@ -0,0 +1,110 @@
+import audioop
+import threading
+import time
+from collections import deque
+
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30            # 480 samples per read at 16 kHz
+BUFFER_SECONDS = 20      # how much recent audio the ring buffer keeps
+CALIBRATION_SECONDS = 1.0
+ENERGY_RATIO = 1.5       # speech must be this much louder than the ambient level
+MIN_ENERGY_THRESHOLD = 300
+AMBIENT_ADAPT_RATE = 0.05  # how quickly the ambient level follows quiet frames
+
+class MicrophoneStream:
+    """One always-open microphone read by a background thread into a ring buffer
+
+    Ambient noise is measured once when the stream opens and then tracked from
+    quiet frames, so listening never has to stop for a calibration pause
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, buffer_seconds=BUFFER_SECONDS):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_seconds = frame_ms / 1000
+        self.sample_width = 2
+        self.frames = deque(maxlen=int(buffer_seconds / self.frame_seconds))  # (seq, time, data, energy)
+        self.seq = 0
+        self.ambient_energy = None
+        self.energy_threshold = MIN_ENERGY_THRESHOLD
+        self.condition = threading.Condition()
+        self.thread = None
+        self.error = None
+
+    def start(self):
+        """Open the microphone once; later calls are no-ops while it is running"""
+        with self.condition:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.error = None
+            ready = threading.Event()
+            self.thread = threading.Thread(target=self._run, args=(ready,), name="microphone", daemon=True)
+            self.thread.start()
+        ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def frames_after(self, seq, timeout=None):
+        """Frames newer than seq, waiting for at least one; [] on timeout"""
+        with self.condition:
+            if self.seq <= seq:
+                self.condition.wait(timeout)
+            if self.error is not None and self.seq <= seq:
+                raise self.error
+            return [frame for frame in self.frames if frame[0] > seq]
+
+    def seq_before(self, seconds):
+        """Sequence number of the frame captured `seconds` ago (for pre-roll)"""
+        with self.condition:
+            cutoff = time.monotonic() - seconds
+            for frame in self.frames:
+                if frame[1] >= cutoff:
+                    return frame[0] - 1
+            return self.seq
+
+    def _calibrate(self, energy):
+        if self.ambient_energy is None:
+            self.ambient_energy = energy
+        elif energy < self.energy_threshold:
+            # Only quiet frames move the ambient level, so speech and our own TTS don't raise it
+            self.ambient_energy += (energy - self.ambient_energy) * AMBIENT_ADAPT_RATE
+        self.energy_threshold = max(MIN_ENERGY_THRESHOLD, self.ambient_energy * ENERGY_RATIO)
+
+    def _run(self, ready):
+        try:
+            microphone = sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.frame_samples)
+            source = microphone.__enter__()
+        except Exception as e:
+            self.error = e
+            ready.set()
+            return
+
+        try:
+            self.sample_width = source.SAMPLE_WIDTH
+            # One-time ambient calibration, then listening is immediate from here on
+            energies = []
+            for _ in range(int(CALIBRATION_SECONDS / self.frame_seconds)):
+                energies.append(audioop.rms(source.stream.read(self.frame_samples), self.sample_width))
+            self.ambient_energy = sum(energies) / len(energies)
+            self.energy_threshold = max(MIN_ENERGY_THRESHOLD, self.ambient_energy * ENERGY_RATIO)
+            print(f"🎚️ Microphone calibrated: ambient {self.ambient_energy:.0f}, threshold {self.energy_threshold:.0f}")
+            ready.set()
+
+            while True:
+                data = source.stream.read(self.frame_samples)
+                energy = audioop.rms(data, self.sample_width)
+                with self.condition:
+                    self._calibrate(energy)
+                    self.seq += 1
+                    self.frames.append((self.seq, time.monotonic(), data, energy))
+                    self.condition.notify_all()
+        except Exception as e:
+            print(f"❌ Microphone stream stopped: {e}")
+            with self.condition:
+                self.error = e
+                self.condition.notify_all()
+            ready.set()
+        finally:
+            microphone.__exit__(None, None, None)
@@ -1,14 +1,96 @@
+import time
+
 import speech_recognition as sr
 
-def listen():
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("🎙️ Listening...")
-        r.adjust_for_ambient_noise(source)
-        audio = r.listen(source)
+from voice.asr import get_recognizer
+from voice.capture import MicrophoneStream
+from voice.vad import SpeechClassifier, Endpointer, END_SILENCE_SECONDS
+
+PRE_ROLL_SECONDS = 0.3   # audio kept from just before listen() so a word's onset isn't clipped
+
+# Shared by every caller that listens, so the microphone is opened and calibrated only once
+microphone = MicrophoneStream()
+classifier = SpeechClassifier(microphone.sample_rate)
+last_heard_seq = 0  # end of the previous phrase; pre-roll never reaches back past it
+dropped_bursts = 0  # voiced blips too short to be speech, never sent to a recognizer
+
+def capture_utterance(timeout=None, phrase_time_limit=None, end_silence_seconds=END_SILENCE_SECONDS,
+                      on_audio=None):
+    """Next phrase from the shared microphone as sr.AudioData (raises sr.WaitTimeoutError like Recognizer.listen)
+
+    Only frames the VAD calls speech open a phrase, and silence on both ends is trimmed,
+    so recognizers are never called on a stretch of quiet room noise.
+    on_audio(data) receives phrase frames as they arrive, and on_audio(None) when a
+    started phrase turns out to be a dropped burst
+    """
+    global last_heard_seq, dropped_bursts
+    microphone.start()
+    seq = max(microphone.seq_before(PRE_ROLL_SECONDS), last_heard_seq)
+    endpointer = Endpointer(microphone.frame_seconds, end_silence_seconds)
+    # Wall-clock deadline, so a stalled microphone can't keep us waiting forever
+    deadline = time.monotonic() + timeout if timeout else None
+    spoken = 0.0
+    fed = 0
+
+    while True:
+        wait = microphone.frame_seconds * 10
+        if deadline is not None and not endpointer.in_phrase:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            wait = min(wait, remaining)
+        frames = microphone.frames_after(seq, timeout=wait)
+        for seq, _, data, energy in frames:
+            voiced = classifier.is_speech(data, energy, microphone.energy_threshold)
+            phrase = endpointer.feed(data, voiced)
+            if on_audio and endpointer.in_phrase:
+                for frame_data, _ in endpointer.frames[fed:]:
+                    on_audio(frame_data)
+                fed = len(endpointer.frames)
+            if endpointer.in_phrase:
+                spoken += microphone.frame_seconds
+                if phrase_time_limit and spoken >= phrase_time_limit:
+                    phrase = endpointer.finish()
+
+            if phrase == "":
+                dropped_bursts += 1
+                spoken = 0.0
+                if on_audio and fed:
+                    on_audio(None)
+                fed = 0
+            elif phrase:
+                last_heard_seq = seq
+                return sr.AudioData(phrase, microphone.sample_rate, microphone.sample_width)
+
+def recognize_live(language, on_partial, **capture_options):
+    """Capture and recognize at once, reporting partial transcripts while the user speaks"""
+    recognizer = get_recognizer()
+    if not recognizer.streaming:
+        return recognizer.transcribe(capture_utterance(**capture_options), language)
+
+    state = {"stream": recognizer.stream(language), "partial": ""}
+
+    def feed(data):
+        if data is None:  # dropped burst - start over
+            state["stream"] = recognizer.stream(language)
+            state["partial"] = ""
+            return
+        partial = state["stream"].accept(data)
+        if partial and partial != state["partial"]:
+            state["partial"] = partial
+            on_partial(partial)
+
+    capture_utterance(on_audio=feed, **capture_options)
+    return state["stream"].final()
+
+def listen(language='ta-IN', on_partial=None):
+    print("🎙️ Listening...")
 
     try:
-        text = r.recognize_google(audio, language='ta-IN')  # or 'ta-IN' for Tamil
+        if on_partial:
+            text = recognize_live(language, on_partial)
+        else:
+            text = get_recognizer().transcribe(capture_utterance(), language)
         print(f"🗣️ You said: {text}")
         return text.lower()
     except sr.UnknownValueError:
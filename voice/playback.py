@@ -0,0 +1,161 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pygame
+
+POLL_INTERVAL = 0.05  # how often a playing clip is checked for its end or an interruption
+
+class PlaybackService:
+    """Single long-lived thread that owns the pygame mixer and plays queued clips in order
+
+    play() returns a Future resolved with the clip's timings once it finishes,
+    or with None when no audio device is available
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.clips = queue.Queue()
+        self.stop_current = threading.Event()
+        self.generation = 0  # bumped by interrupt(); clips queued before it are dropped
+        self.lock = threading.Lock()
+        self.thread = None
+        self.available = None  # unknown until the mixer is first initialized
+        self.current = None
+        self.stats = {"played": 0, "interrupted": 0, "failed": 0, "start_ms": [], "queue_ms": []}
+
+    def play(self, source, hint=None, label=None):
+        """Queue a file path or file-like object (hint names its format, e.g. "mp3")"""
+        done = Future()
+        with self.lock:
+            self._ensure_thread()
+            self.clips.put((self.generation, source, hint, label, time.perf_counter(), done))
+        return done
+
+    def interrupt(self):
+        """Stop the clip that is playing and drop everything queued; returns how many were dropped"""
+        with self.lock:
+            self.generation += 1
+            self.stop_current.set()
+        dropped = 0
+        while True:
+            try:
+                clip = self.clips.get_nowait()
+            except queue.Empty:
+                break
+            if clip is None:
+                self.clips.put(None)
+                break
+            clip[-1].cancel()
+            dropped += 1
+        return dropped
+
+    def is_busy(self):
+        return self.current is not None or not self.clips.empty()
+
+    def metrics(self):
+        with self.lock:
+            start_ms = list(self.stats["start_ms"])
+            queue_ms = list(self.stats["queue_ms"])
+            return {
+                "available": self.available,
+                "played": self.stats["played"],
+                "interrupted": self.stats["interrupted"],
+                "failed": self.stats["failed"],
+                "queued": self.clips.qsize(),
+                "avg_start_ms": round(sum(start_ms) / len(start_ms), 1) if start_ms else None,
+                "max_start_ms": round(max(start_ms), 1) if start_ms else None,
+                "avg_queue_ms": round(sum(queue_ms) / len(queue_ms), 1) if queue_ms else None,
+            }
+
+    def close(self):
+        self.interrupt()
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread:
+            self.clips.put(None)
+            thread.join(timeout=2)
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="playback", daemon=True)
+            self.thread.start()
+
+    def _init_mixer(self):
+        try:
+            pygame.mixer.init()
+            self.available = True
+        except Exception as e:
+            # In container environments there is no audio device - browser TTS handles audio
+            self.available = False
+            print(f"⚠️ Audio playback not available (container environment): {e}")
+            print("   Using browser-based text-to-speech instead")
+
+    def _run(self):
+        self._init_mixer()
+        try:
+            while True:
+                clip = self.clips.get()
+                if clip is None:
+                    break
+                generation, source, hint, label, queued_at, done = clip
+                if generation != self.generation or not done.set_running_or_notify_cancel():
+                    continue
+                if not self.available:
+                    done.set_result(None)
+                    continue
+                self.current = label
+                try:
+                    done.set_result(self._play(generation, source, hint, label, queued_at))
+                except Exception as e:
+                    with self.lock:
+                        self.stats["failed"] += 1
+                    done.set_exception(e)
+                finally:
+                    self.current = None
+        finally:
+            if self.available:
+                pygame.mixer.quit()
+
+    def _play(self, generation, source, hint, label, queued_at):
+        picked_at = time.perf_counter()
+        with self.lock:
+            if generation == self.generation:
+                self.stop_current.clear()
+        if hint:
+            pygame.mixer.music.load(source, hint)
+        else:
+            pygame.mixer.music.load(source)
+        pygame.mixer.music.play()
+        started_at = time.perf_counter()
+
+        # Sleep between checks instead of spinning; an interruption wakes us at once
+        interrupted = False
+        while pygame.mixer.music.get_busy():
+            if self.stop_current.wait(self.poll_interval):
+                pygame.mixer.music.stop()
+                interrupted = True
+                break
+        pygame.mixer.music.unload()
+        ended_at = time.perf_counter()
+
+        result = {
+            "label": label,
+            "queue_ms": (picked_at - queued_at) * 1000,
+            "start_ms": (started_at - queued_at) * 1000,
+            "duration_ms": (ended_at - started_at) * 1000,
+            "interrupted": interrupted,
+            "started_at": started_at,  # perf_counter() clock, for gaps between clips
+            "ended_at": ended_at,
+        }
+        with self.lock:
+            self.stats["interrupted" if interrupted else "played"] += 1
+            # Keep a bounded window of recent timings for the averages
+            self.stats["start_ms"] = (self.stats["start_ms"] + [result["start_ms"]])[-100:]
+            self.stats["queue_ms"] = (self.stats["queue_ms"] + [result["queue_ms"]])[-100:]
+        return result
+
+# Shared by voice.speaker and translator.speech_output so only one clip plays at a time
+playback = PlaybackService()
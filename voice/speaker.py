@@ -1,27 +1,14 @@
-from gtts import gTTS
-import pygame
-import os
+from voice.speech_pipeline import speech_pipeline
 
-def speak(text):
+def speak(text, wait=True, lang="ta"):
+    """Speak the reply sentence by sentence; wait=False returns the Future instead of blocking"""
     print(f"🤖 zara (Tamil): {text}")
 
-    # Check if we're in a container environment (no audio device)
-    try:
-        # Try to initialize pygame mixer
-        pygame.mixer.init()
-        pygame.mixer.music.load("voice.mp3")
-        pygame.mixer.music.play()
+    # Each sentence is synthesized (or taken from the phrase cache) while the previous one plays
+    done = speech_pipeline.speak(text, lang, wait=wait)
+    done.add_done_callback(_report_failure)
+    return done
 
-        while pygame.mixer.music.get_busy():
-            continue
-
-        pygame.mixer.quit()
-        os.remove("voice.mp3")
-    except Exception as e:
-        # In container environments, audio won't work
-        # This is expected - browser TTS will handle the audio
-        print(f"⚠️ Audio playback not available (container environment): {e}")
-        print("   Using browser-based text-to-speech instead")
-
-    # Note: TTS file generation is handled by browser now
-    # We keep this for potential future use or local testing
+def _report_failure(done):
+    if not done.cancelled() and done.exception() is not None:
+        print(f"⚠️ Speech output failed: {done.exception()}")
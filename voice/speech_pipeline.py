@@ -0,0 +1,137 @@
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_for
+from io import BytesIO
+
+from voice.playback import playback
+from voice.tts import tts_cache
+
+# English/Tamil full stops and marks, Hindi danda (।) and double danda (॥), or a line break
+SPEECH_BOUNDARY = re.compile(r"(?<=[.!?।॥])\s+|\n+")
+MIN_SENTENCE_CHARS = 20  # short fragments ("1.", "சரி.") ride along with the next sentence
+LOOKAHEAD = 2            # sentences synthesized ahead of the one being played
+
+def split_for_speech(text):
+    """Sentences to synthesize one by one, with tiny fragments merged into their neighbour"""
+    sentences = []
+    pending = ""
+    for part in SPEECH_BOUNDARY.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}".strip()
+        if len(pending) >= MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+class SpeechPipeline:
+    """Synthesizes sentence N+1 while sentence N plays, so speech starts after the first sentence"""
+
+    def __init__(self, cache=tts_cache, player=playback, lookahead=LOOKAHEAD, workers=2):
+        self.cache = cache
+        self.player = player
+        self.lookahead = lookahead
+        self.synth_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+
+    def speak(self, text, lang, wait=True):
+        """Future resolved with the timing report once everything was played (None without audio)"""
+        if wait:
+            done = Future()
+            done.set_running_or_notify_cancel()
+            self._run(text, lang, done)
+            return done
+        done = Future()
+        threading.Thread(target=self._run_started, args=(text, lang, done), daemon=True).start()
+        return done
+
+    def _run_started(self, text, lang, done):
+        if done.set_running_or_notify_cancel():
+            self._run(text, lang, done)
+
+    def _run(self, text, lang, done):
+        try:
+            done.set_result(self._speak(text, lang))
+        except Exception as e:
+            done.set_exception(e)
+
+    def _synthesize(self, sentence, lang):
+        started = time.perf_counter()
+        audio = self.cache.get(sentence, lang)
+        return audio, (time.perf_counter() - started) * 1000
+
+    def _speak(self, text, lang):
+        # No audio device - don't spend gTTS calls on speech nobody will hear
+        if self.player.available is False:
+            return None
+
+        began = time.perf_counter()
+        sentences = split_for_speech(text)
+        synths = [self.synth_pool.submit(self._synthesize, s, lang) for s in sentences[:self.lookahead + 1]]
+        clips = []
+        report = {"sentences": len(sentences), "synth_ms": [], "synth_wait_ms": [], "interrupted": False}
+
+        try:
+            for index, sentence in enumerate(sentences):
+                # Time spent here means synthesis fell behind playback
+                waited = time.perf_counter()
+                audio, synth_ms = synths[index].result()
+                report["synth_wait_ms"].append((time.perf_counter() - waited) * 1000)
+                report["synth_ms"].append(synth_ms)
+
+                next_index = index + self.lookahead + 1
+                if next_index < len(sentences):
+                    synths.append(self.synth_pool.submit(self._synthesize, sentences[next_index], lang))
+
+                # Stop feeding if the last clip was cut off (barge-in) or dropped
+                if clips and self._stopped(clips[-1]):
+                    report["interrupted"] = True
+                    break
+                clips.append(self.player.play(BytesIO(audio), hint="mp3", label=sentence))
+
+                # Keep at most `lookahead` clips waiting in the player queue
+                if len(clips) > self.lookahead:
+                    wait_for([clips[-self.lookahead - 1]])
+
+            results = []
+            for clip in clips:
+                if clip.cancelled():
+                    report["interrupted"] = True
+                    break
+                result = clip.result()
+                if result is None:
+                    return None
+                results.append(result)
+                if result["interrupted"]:
+                    report["interrupted"] = True
+                    break
+        finally:
+            for synth in synths:
+                synth.cancel()
+
+        if not results:
+            return report
+        report["first_audio_ms"] = (results[0]["started_at"] - began) * 1000
+        report["queue_ms"] = [r["queue_ms"] for r in results]
+        report["gap_ms"] = [(later["started_at"] - earlier["ended_at"]) * 1000
+                            for earlier, later in zip(results, results[1:])]
+        print(f"🗣️ {len(results)}/{len(sentences)} sentences | first audio {report['first_audio_ms']:.0f} ms | "
+              f"synth avg {sum(report['synth_ms']) / len(report['synth_ms']):.0f} ms | "
+              f"max gap {max(report['gap_ms'], default=0):.0f} ms")
+        return report
+
+    def _stopped(self, clip):
+        if not clip.done():
+            return False
+        if clip.cancelled() or clip.exception() is not None:
+            return True
+        return bool(clip.result() and clip.result()["interrupted"])
+
+# Shared by voice.speaker and translator.speech_output
+speech_pipeline = SpeechPipeline()
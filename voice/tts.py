@@ -0,0 +1,155 @@
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from io import BytesIO
+
+from gtts import gTTS
+
+CACHE_DIR = os.path.join(os.getcwd(), "tts_cache")
+DEFAULT_VOICE = "gtts"
+
+# Fixed prompts worth having ready before anyone asks for them
+SYSTEM_PHRASES = [
+    "வணக்கம்! நான் ஜாரா. இன்று நான் உங்களுக்கு எப்படி உதவ முடியும்?",
+    "உங்கள் பேச்சை புரிந்துகொள்ள முடியவில்லை.",
+    "எந்த பாடலை கேட்க விரும்புகிறீர்கள்?",
+    "எந்த பாடலை கேட்க விரும்புகிறீர்கள்? பாடல் பெயரை சொல்லுங்கள்.",
+    "பாடல் கோரிக்கை புரிந்துகொள்ள முடியவில்லை.",
+    "Spotify தேடலில் பிழை.",
+    "Spotify இல் பிழை ஏற்பட்டது.",
+    "மொழிபெயர்ப்பு நிறுத்தப்பட்டது.",
+    "தேர்வு புரிந்துகொள்ள முடியவில்லை. மீண்டும் சொல்லுங்கள்.",
+]
+
+def audio_key(text, lang, voice=DEFAULT_VOICE):
+    """Content address of one synthesized phrase"""
+    text = unicodedata.normalize("NFC", text).strip()
+    return hashlib.sha256(f"{voice}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+
+def synthesize(text, lang):
+    """Run gTTS into memory and return the MP3 bytes"""
+    buffer = BytesIO()
+    gTTS(text=text, lang=lang).write_to_fp(buffer)
+    return buffer.getvalue()
+
+class TTSCache:
+    """Synthesized speech by (text, lang, voice): LRU in RAM, LRU on disk, gTTS on a miss"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_memory_bytes=8 * 1024 * 1024,
+                 max_disk_bytes=64 * 1024 * 1024, synthesizer=synthesize):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.synthesizer = synthesizer
+        self.memory = OrderedDict()  # key -> mp3 bytes
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.pending = {}  # key -> Event, so one phrase is only synthesized once at a time
+        self.hits = {"memory": 0, "disk": 0, "synthesized": 0}
+
+    def get(self, text, lang, voice=DEFAULT_VOICE):
+        """MP3 bytes for the phrase, synthesizing and caching it if needed"""
+        key = audio_key(text, lang, voice)
+        while True:
+            with self.lock:
+                audio = self.memory.get(key)
+                if audio is not None:
+                    self.memory.move_to_end(key)
+                    self.hits["memory"] += 1
+                    return audio
+                waiting = self.pending.get(key)
+                if waiting is None:
+                    self.pending[key] = threading.Event()
+                    break
+            # Someone else is already fetching this phrase; use their result
+            waiting.wait()
+
+        try:
+            audio = self._read_disk(key)
+            if audio is not None:
+                with self.lock:
+                    self.hits["disk"] += 1
+            else:
+                audio = self.synthesizer(text, lang)
+                with self.lock:
+                    self.hits["synthesized"] += 1
+                self._write_disk(key, audio)
+            self._remember(key, audio)
+            return audio
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+
+    def prewarm(self, phrases, lang="ta", voice=DEFAULT_VOICE):
+        """Fetch phrases in the background so they play with no network or disk I/O later"""
+        def warm():
+            for phrase in phrases:
+                try:
+                    self.get(phrase, lang, voice)
+                except Exception as e:
+                    print(f"⚠️ TTS pre-warm failed for {phrase[:30]!r}: {e}")
+                    return  # most likely offline; the rest would fail the same way
+            print(f"🔥 Pre-warmed {len(phrases)} phrases")
+        thread = threading.Thread(target=warm, name="tts-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        with self.lock:
+            return {
+                **self.hits,
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory_bytes,
+            }
+
+    def _remember(self, key, audio):
+        with self.lock:
+            if key in self.memory:
+                return
+            self.memory[key] = audio
+            self.memory_bytes += len(audio)
+            while self.memory_bytes > self.max_memory_bytes and len(self.memory) > 1:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # mtime doubles as the disk LRU clock
+            return audio
+        except OSError:
+            return None
+
+    def _write_disk(self, key, audio):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._path(key))
+            self._trim_disk()
+        except OSError as e:
+            print(f"⚠️ Could not write TTS cache: {e}")
+
+    def _trim_disk(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".mp3"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                files.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+# Shared by voice.speaker and translator.speech_output
+tts_cache = TTSCache()
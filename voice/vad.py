@@ -0,0 +1,86 @@
+from collections import deque
+
+try:
+    import webrtcvad
+except ImportError:  # fall back to the microphone's adaptive energy threshold
+    webrtcvad = None
+
+VAD_AGGRESSIVENESS = 2     # 0-3, higher rejects more non-speech
+START_WINDOW_SECONDS = 0.3
+START_RATIO = 0.6          # share of voiced frames in the start window that opens a phrase
+END_SILENCE_SECONDS = 0.6  # trailing silence that ends a phrase
+END_RATIO = 0.9            # share of unvoiced frames in the end window that closes it
+LEAD_PADDING_SECONDS = 0.2
+TRAIL_PADDING_SECONDS = 0.15
+MIN_SPEECH_SECONDS = 0.25  # shorter voiced bursts (clicks, coughs) are dropped without recognition
+
+class SpeechClassifier:
+    """Per-frame speech/non-speech decision, WebRTC VAD when available"""
+
+    def __init__(self, sample_rate, aggressiveness=VAD_AGGRESSIVENESS):
+        self.sample_rate = sample_rate
+        self.vad = webrtcvad.Vad(aggressiveness) if webrtcvad else None
+
+    def is_speech(self, data, energy, energy_threshold):
+        if self.vad is not None:
+            # Loudness alone is not speech, but very quiet frames never are
+            return energy > energy_threshold / 2 and self.vad.is_speech(data, self.sample_rate)
+        return energy > energy_threshold
+
+class Endpointer:
+    """Finds where one phrase starts and ends in a stream of frames and trims the silence around it"""
+
+    def __init__(self, frame_seconds, end_silence_seconds=END_SILENCE_SECONDS):
+        self.frame_seconds = frame_seconds
+        self.start_window = deque(maxlen=max(1, round(START_WINDOW_SECONDS / frame_seconds)))
+        self.end_window = deque(maxlen=max(1, round(end_silence_seconds / frame_seconds)))
+        self.lead_frames = round(LEAD_PADDING_SECONDS / frame_seconds)
+        self.trail_frames = round(TRAIL_PADDING_SECONDS / frame_seconds)
+        self.min_voiced = round(MIN_SPEECH_SECONDS / frame_seconds)
+        self.reset()
+
+    def reset(self):
+        self.start_window.clear()
+        self.end_window.clear()
+        self.frames = []        # [(data, voiced)] of the phrase in progress
+        self.in_phrase = False
+        self.voiced_count = 0
+
+    def feed(self, data, voiced):
+        """Add one frame; returns the trimmed phrase bytes once it has ended, "" for a dropped burst, else None"""
+        if not self.in_phrase:
+            self.start_window.append((data, voiced))
+            voiced_share = sum(1 for _, v in self.start_window if v) / self.start_window.maxlen
+            if voiced_share < START_RATIO:
+                return None
+            # Keep a little of what came before the first voiced frame of the window
+            self.in_phrase = True
+            self.frames = list(self.start_window)
+            self.voiced_count = sum(1 for _, v in self.frames if v)
+            self.end_window.extend(v for _, v in self.frames)
+            return None
+
+        self.frames.append((data, voiced))
+        self.end_window.append(voiced)
+        self.voiced_count += voiced
+        if len(self.end_window) < self.end_window.maxlen:
+            return None
+        unvoiced_share = sum(1 for v in self.end_window if not v) / self.end_window.maxlen
+        if unvoiced_share < END_RATIO:
+            return None
+        return self._finish()
+
+    def finish(self):
+        """Close the phrase early (phrase time limit reached)"""
+        return self._finish() if self.in_phrase else ""
+
+    def _finish(self):
+        frames = self.frames
+        voiced = [i for i, (_, v) in enumerate(frames) if v]
+        enough = len(voiced) >= self.min_voiced
+        self.reset()
+        if not enough:
+            return ""
+        first = max(0, voiced[0] - self.lead_frames)
+        last = min(len(frames), voiced[-1] + 1 + self.trail_frames)
+        return b"".join(data for data, _ in frames[first:last])
@@ -1,5 +1,6 @@
 from translator.speech_input import recognize_speech
 from translator.translator_engine import translate_tamil_to_hindi
+from translator.translation_service import TranslationError, failure_prompt
 from translator.speech_output import speak_text
 
 def tamil_to_hindi_loop():
@@ -15,7 +16,11 @@ def tamil_to_hindi_loop():
             continue
 
         print(f"🗣️ Tamil: {input_text}")
-        hindi_output = translate_tamil_to_hindi(input_text)
+        try:
+            hindi_output = translate_tamil_to_hindi(input_text)
+        except TranslationError as e:
+            print(f"❌ Translation failed: {e}")
+            hindi_output = failure_prompt("hindi")
         print(f"📝 Hindi: {hindi_output}")
         speak_text(hindi_output)
 
@@ -3,17 +3,27 @@ Web UI Server for Zara AI - Orb Interface
 Handles WebSocket communication between the orb UI and the AI backend
 """
 
-from flask import Flask, render_template, jsonify
+# Must come first so gevent can patch sockets/threads before they are imported
+from server_async import ASYNC_MODE
+
+from flask import Flask, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 import threading
 import queue
 import time
 from voice.speaker import speak
+from voice.playback import playback
+from voice.tts import tts_cache, SYSTEM_PHRASES
+from voice.speech_pipeline import split_for_speech
 from voice.listener import listen
-from ai.gemini_ai import get_response
+from ai.gemini_ai import stream_response, response_cache, scheduler, chat_contexts, prewarm
 from tasks.general_tasks import execute_command
+from command_pipeline import CommandPipeline
+from sessions import SessionRegistry
+from conversation_logger import log_conversation
+from intents import router
+from gesture.service import gesture_service
 import os
-from datetime import datetime
 
 # Import translation functions
 from translator.speech_input import recognize_speech
@@ -25,27 +35,42 @@ import webbrowser
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'zara-orb-secret-key'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE)
 
 # Queue for communication between threads
 command_queue = queue.Queue()
 response_queue = queue.Queue()
 
-# Logging function
-def log_conversation(role, message):
-    log_path = os.path.join(os.getcwd(), "conversation_log.txt")
-    with open(log_path, "a", encoding="utf-8") as log_file:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_file.write(f"[{timestamp}] {role}: {message}\n")
-
-# State management
-current_state = {"status": "ready"}
-
-def update_orb_state(state):
-    """Update the orb state and emit to all connected clients"""
-    current_state["status"] = state
-    socketio.emit('state_change', {'state': state})
-    print(f"🔄 Orb state changed to: {state}")
+# Intents the browser flow handles itself; the rest go to execute_command or Gemini
+WEB_INTENTS = {"music", "play_song", "gesture", "gesture_stop"}
+
+# Start the headless gesture worker with the server (kiosks with a camera)
+GESTURE_AUTOSTART = os.environ.get('ZARA_GESTURES', '0') == '1'
+
+# Phrases that mark a canned fallback answer instead of a real Gemini response
+FALLBACK_PHRASES = [
+    "மன்னிக்கவும், நான் தற்போது",
+    "விரிவான பதில்கள் கொடுக்க முடியாது"
+]
+
+# State management - one session per connected client, keyed by Socket.IO sid
+def create_pipeline(sid):
+    def handle(command, cancel_event):
+        process_command(command, cancel_event, sid=sid)
+    return CommandPipeline(handle, socketio.start_background_task)
+
+sessions = SessionRegistry(create_pipeline)
+
+def update_orb_state(state, sid=None):
+    """Update the orb state of one client (or all clients when sid is None) and emit it"""
+    if sid is not None:
+        session = sessions.get(sid)
+        if session is None:
+            return  # client disconnected or expired while the command was running
+        session.status = state
+        session.touch()
+    socketio.emit('state_change', {'state': state}, to=sid)
+    print(f"🔄 Orb state changed to: {state}" + (f" [{sid}]" if sid else ""))
 
 def search_and_play_song_no_auth(song_query):
     """Search and play song on Spotify (web version)"""
@@ -64,69 +89,99 @@ def search_and_play_song_no_auth(song_query):
         speak("Spotify தேடலில் பிழை.")
         return False
 
-def process_command(command):
-    """Process user commands"""
+def process_command(command, cancel_event=None, sid=None):
+    """Process user commands, replying only to the client that sent them"""
     if not command:
         return
 
+    cancel_event = cancel_event or threading.Event()
+
     print(f"[USER COMMAND]: {command}")
-    log_conversation("User", command)
+    log_conversation("User", command, session_id=sid)
+    started = time.monotonic()
 
     # Update orb to processing state
-    update_orb_state('processing')
+    update_orb_state('processing', sid)
+
+    # Check for specific commands (one pass over the utterance for all intent keywords)
+    intent = router.best(command, group="command", allowed=WEB_INTENTS)
+    intent_name = intent.name if intent else None
 
-    # Check for specific commands
-    
     # Spotify/music command
-    if any(kw in command.lower() for kw in ["play song", "play music", "spotify", "பாடல் இசை", "இசை இசை", "song play", "music play"]):
-        update_orb_state('speaking')
+    if intent_name == "music":
+        update_orb_state('speaking', sid)
         song_msg = "எந்த பாடலை கேட்க விரும்புகிறீர்கள்? பாடல் பெயரை சொல்லுங்கள்."
 
         # Send to browser for speech synthesis
-        socketio.emit('speak_text', {'text': song_msg})
+        socketio.emit('speak_text', {'text': song_msg}, to=sid)
 
         try:
             speak(song_msg)
         except Exception as e:
             print(f"⚠️ Local audio playback failed: {e}")
 
-        update_orb_state('ready')
+        update_orb_state('ready', sid)
         # Browser will listen and send the song name as next command
         return
 
     # If direct song search (contains "play" + song name)
-    if "play" in command.lower() and len(command.split()) > 1:
-        parts = command.lower().split("play", 1)
-        if len(parts) > 1:
-            song_name = parts[1].strip()
-            if song_name:
-                update_orb_state('speaking')
-                search_and_play_song_no_auth(song_name)
-                update_orb_state('ready')
-                return
+    if intent_name == "play_song":
+        update_orb_state('speaking', sid)
+        search_and_play_song_no_auth(intent.remainder())
+        update_orb_state('ready', sid)
+        return
+
+    # Gesture recognition runs headless on the server; recognized gestures arrive as events
+    if intent_name in ("gesture", "gesture_stop"):
+        if intent_name == "gesture":
+            gesture_started = gesture_service.start()
+            reply = "கை சைகை அறிதல் தொடங்கப்பட்டது." if gesture_started else "கை சைகை அறிதல் ஏற்கனவே இயங்குகிறது."
+        else:
+            gesture_service.stop()
+            reply = "கை சைகை அறிதல் நிறுத்தப்பட்டது."
+        announce(reply, sid)
+        return
 
     # If general task command
     if execute_command(command):
-        log_conversation("Assistant", "Executed general task command.")
-        update_orb_state('ready')
+        log_conversation("Assistant", "Executed general task command.", session_id=sid,
+                         latency_ms=round((time.monotonic() - started) * 1000))
+        update_orb_state('ready', sid)
         return
 
-    # Use Gemini AI to respond
-    response = get_response(command)
-    log_conversation("Assistant", response)
-    update_orb_state('speaking')
-
-    # Check if response is from fallback (contains certain keywords)
-    is_fallback = any(phrase in response for phrase in [
-        "மன்னிக்கவும், நான் தற்போது",
-        "விரிவான பதில்கள் கொடுக்க முடியாது"
-    ])
-
-    # Send text to browser for speech synthesis with fallback indicator
-    socketio.emit('speak_text', {
-        'text': response,
-        'is_fallback': is_fallback
-    })
+    # Use Gemini AI to respond, streaming sentence chunks to the browser as they arrive
+    chunks = []
+    first_chunk_ms = None
+    for index, chunk in enumerate(stream_response(command, session_id=sid)):
+        if cancel_event.is_set():
+            # User barged in - stop speaking this answer
+            print(f"✋ Command superseded: {command}")
+            break
+
+        if index == 0:
+            first_chunk_ms = round((time.monotonic() - started) * 1000)
+            update_orb_state('speaking', sid)
+
+        # Check if response is from fallback (contains certain keywords)
+        is_fallback = any(phrase in chunk for phrase in FALLBACK_PHRASES)
+
+        # Send each chunk to browser so speech synthesis starts on the first sentence
+        socketio.emit('speak_text_chunk', {
+            'text': chunk,
+            'index': index,
+            'is_fallback': is_fallback
+        }, to=sid)
+        chunks.append(chunk)
+
+    response = "\n".join(chunks)
+    socketio.emit('speak_text_chunk', {'text': '', 'index': len(chunks), 'final': True}, to=sid)
+    log_conversation("Assistant", response, session_id=sid,
+                     latency_ms=round((time.monotonic() - started) * 1000),
+                     first_chunk_ms=first_chunk_ms,
+                     cancelled=cancel_event.is_set())
+
+    if cancel_event.is_set():
+        return
 
     # Try to speak locally (will fail in container, but that's ok)
     try:
@@ -134,36 +189,75 @@ def process_command(command):
     except Exception as e:
         print(f"⚠️ Local audio playback failed (expected in container): {e}")
 
+    update_orb_state('ready', sid)
+
+def announce(text, sid=None):
+    """Speak a short reply on the orb of one client (or every client when sid is None)"""
+    update_orb_state('speaking', sid)
+    socketio.emit('speak_text', {'text': text}, to=sid)
+    log_conversation("Assistant", text, session_id=sid)
+    try:
+        speak(text)
+    except Exception as e:
+        print(f"⚠️ Local audio playback failed: {e}")
+    update_orb_state('ready', sid)
+
+def stop_everything():
+    """Cancel every client's commands and silence local playback, like a barge-in on all orbs"""
+    for session in sessions.snapshot():
+        session.pipeline.cancel()
+    playback.interrupt()
     update_orb_state('ready')
 
-def ai_interaction_loop():
-    """Main AI interaction loop - just sends welcome and waits for browser commands"""
-    print("🤖 AI Interaction Loop Started")
-    print("📱 Voice recognition will happen in the browser (on your phone)")
-    
-    # Welcome message
-    welcome_msg = "வணக்கம்! நான் ஜாரா. இன்று நான் உங்களுக்கு எப்படி உதவ முடியும்?"
-    update_orb_state('speaking')
-    time.sleep(0.5)  # Give time for state to propagate
+def handle_gesture_event(event):
+    """Debounced gesture from the gesture worker - show it on every orb and act on its definition"""
+    socketio.emit('gesture', event)
+    if event["type"] != "start":
+        return
+    definition = gesture_service.definition(event["gesture"])
+    log_conversation("User", f"Gesture: {event['gesture']}")
+    if definition.get("action") == "stop":
+        stop_everything()
+    elif definition.get("say"):
+        socketio.start_background_task(announce, definition["say"])
+
+gesture_service.subscribe(handle_gesture_event)
 
-    # Send welcome message to browser for speech synthesis
-    socketio.emit('speak_text', {'text': welcome_msg})
+def session_sweeper():
+    """Periodically drop sessions of clients that have gone quiet"""
+    while True:
+        socketio.sleep(60)
+        expired = sessions.expire_idle()
+        for sid in expired:
+            chat_contexts.drop(sid)
+        if expired:
+            print(f"🧹 Expired {len(expired)} idle session(s)")
+
+WELCOME_MSG = "வணக்கம்! நான் ஜாரா. இன்று நான் உங்களுக்கு எப்படி உதவ முடியும்?"
+
+def on_server_start():
+    """Startup hook - greet once on the local speaker; browsers are greeted on client_ready"""
+    print("🤖 AI backend started")
+    print("📱 Voice recognition will happen in the browser (on your phone)")
+    tts_cache.prewarm(SYSTEM_PHRASES)
+    if GESTURE_AUTOSTART:
+        gesture_service.start()
 
     # Try to speak locally (will fail in container, but that's ok)
     try:
-        speak(welcome_msg)
+        speak(WELCOME_MSG)
     except Exception as e:
         print(f"⚠️ Local audio playback failed (expected in container): {e}")
 
-    log_conversation("Assistant", welcome_msg)
-    update_orb_state('ready')
-    
+    log_conversation("Assistant", WELCOME_MSG)
     print("✅ AI ready - waiting for voice commands from browser...")
-    
-    # Keep thread alive
-    while True:
-        time.sleep(10)
-        # Just keep alive, all interaction happens via WebSocket events
+
+def on_server_stop():
+    """Shutdown hook - cancel in-flight commands and release every session"""
+    gesture_service.stop()
+    for session in sessions.snapshot():
+        sessions.remove(session.sid)
+    print("👋 All sessions closed")
 
 @app.route('/')
 def index():
@@ -173,35 +267,81 @@ def index():
 @app.route('/status')
 def status():
     """Get current status"""
-    return jsonify(current_state)
+    return jsonify({
+        **sessions.summary(),
+        'response_cache': response_cache.stats(),
+        'gemini_scheduler': scheduler.metrics(),
+        'playback': playback.metrics(),
+        'tts_cache': tts_cache.stats(),
+        'gesture': gesture_service.status()
+    })
 
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
     print('🔌 Client connected')
-    
-    # Send current state
-    emit('state_change', {'state': current_state["status"]})
-    
-    # Send welcome message to newly connected client
-    time.sleep(0.5)  # Small delay to ensure client is ready
-    welcome_msg = "வணக்கம்! நான் ஜாரா. இன்று நான் உங்களுக்கு எப்படி உதவ முடியும்?"
-    emit('speak_text', {'text': welcome_msg})
+    session = sessions.session(request.sid)
+
+    # Send current state; the welcome follows once the client says it is ready
+    emit('state_change', {'state': session.status})
+
+@socketio.on('client_ready')
+def handle_client_ready():
+    """Client has its socket handlers and voices set up - send the welcome message"""
+    sessions.session(request.sid)
+    emit('speak_text', {'text': WELCOME_MSG})
     print(f"📢 Sent welcome message to client")
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     print('🔌 Client disconnected')
+    sessions.remove(request.sid)
+    chat_contexts.drop(request.sid)
 
 @socketio.on('voice_command')
 def handle_voice_command(data):
     """Handle voice command from browser"""
     command = data.get('command', '')
+    sessions.session(request.sid).guess = None  # the final transcript commits; speculation is over
     if command:
         print(f"🎤 Voice command received from browser: {command}")
-        # Process in background thread to not block WebSocket
-        threading.Thread(target=process_command, args=(command,), daemon=True).start()
+        # Queue on this client's pipeline so commands run in order without blocking the WebSocket
+        if not sessions.session(request.sid).pipeline.submit(command):
+            print(f"🚫 Command rejected - queue full: {command}")
+            emit('command_rejected', {'command': command, 'reason': 'queue_full'})
+
+def prewarm_for(guess, text, sid):
+    """Speculative work for a partial transcript - nothing here answers the user"""
+    if guess != "chat":
+        return  # command intents run locally and their prompts are pre-warmed at startup
+    prewarm(sid)
+    cached = response_cache.get(text, record=False)
+    if cached and playback.available is not False:
+        tts_cache.prewarm(split_for_speech(cached))
+
+@socketio.on('voice_partial')
+def handle_voice_partial(data):
+    """Interim transcript while the user is still speaking - guess the intent and warm up for it"""
+    text = data.get('text', '').strip()
+    if not text:
+        return
+    session = sessions.session(request.sid)
+    intent = router.best(text, group="command")
+    guess = intent.name if intent else "chat"
+    if guess == session.guess:
+        return  # already warming up for this
+    session.guess = guess
+    print(f"🔮 Partial '{text}' looks like: {guess}")
+    socketio.start_background_task(prewarm_for, guess, text, request.sid)
+
+@socketio.on('barge_in')
+def handle_barge_in():
+    """User started talking over the answer - cancel what this client is waiting for"""
+    dropped = sessions.session(request.sid).pipeline.cancel()
+    silenced = playback.interrupt()
+    print(f"✋ Barge-in: cancelled current command, dropped {dropped} queued, {silenced} clips silenced")
+    update_orb_state('ready', request.sid)
 
 @socketio.on('browser_state')
 def handle_browser_state(data):
@@ -209,7 +349,7 @@ def handle_browser_state(data):
     state = data.get('state', '')
     if state:
         print(f"📱 Browser state: {state}")
-        update_orb_state(state)
+        update_orb_state(state, request.sid)
 
 def start_server():
     """Start the Flask-SocketIO server"""
@@ -237,18 +377,24 @@ def start_server():
     # Get port from environment variable for hosting
     port = int(os.environ.get('PORT', 5000))
 
-    # Start AI interaction loop in background thread
-    ai_thread = threading.Thread(target=ai_interaction_loop, daemon=True)
-    ai_thread.start()
+    # Lifecycle: one-off startup work and the session sweeper run as background tasks
+    socketio.start_background_task(on_server_start)
+    socketio.start_background_task(session_sweeper)
+
+    # The dev werkzeug server is only used in threading mode
+    run_options = {'allow_unsafe_werkzeug': True} if ASYNC_MODE == 'threading' else {}
+    print(f"⚙️ Async mode: {ASYNC_MODE}")
     
     try:
-        socketio.run(app, host='0.0.0.0', port=port, debug=False, allow_unsafe_werkzeug=True)
+        socketio.run(app, host='0.0.0.0', port=port, debug=False, **run_options)
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
         print(f"\n❌ Server error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        on_server_stop()
 
 if __name__ == "__main__":
     start_server()